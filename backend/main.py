@@ -14,10 +14,12 @@ from genai_session.session import GenAISession
 from genai_session.utils.context import GenAIContext
 from genai_session.utils.exceptions import RouterInaccessibleException
 from src.core.settings import get_settings
+from src.db.session import engine
 from src.middleware.pagination import PaginationMiddleware
 from src.routes.api import api_router
 from src.routes.files.routes import files_router
 from src.routes.websocket import ws_router
+from src.utils.cache import close_redis
 from src.utils.jobs import run_startup_jobs
 from src.utils.message_handler_validator import message_handler_validator
 from src.utils.setup_logger import init_logging
@@ -113,6 +115,9 @@ async def lifespan(app: FastAPI):
 
     except (asyncio.CancelledError, websockets.exceptions.ConnectionClosedError):
         pass
+    finally:
+        await engine.dispose()
+        await close_redis()
 
 
 app = FastAPI(title="GenAI Backend", lifespan=lifespan)
@@ -0,0 +1,65 @@
+"""Add uuid_generate_v7() and use it for server-generated analytics ids
+
+Revision ID: 0b7c4f2e8d19
+Revises: f5b3d8a1c962
+Create Date: 2026-10-15 14:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b7c4f2e8d19"
+down_revision: Union[str, None] = "f5b3d8a1c962"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SERVER_ID_TABLES = ("tokenusages", "executiontraces")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres < 18 has no built-in UUIDv7: take a random v4, overwrite the
+    # first 48 bits with the millisecond timestamp and flip the version bits
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send((extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+        """
+    )
+    for table in SERVER_ID_TABLES:
+        op.alter_column(
+            table,
+            "id",
+            existing_type=sa.UUID(),
+            server_default=sa.text("uuid_generate_v7()"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SERVER_ID_TABLES:
+        op.alter_column(
+            table,
+            "id",
+            existing_type=sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+        )
+    op.execute("DROP FUNCTION uuid_generate_v7()")
@@ -0,0 +1,57 @@
+"""Hourly rollup of agentexecutions as a materialized view
+
+Revision ID: 2c7f9a4e6b05
+Revises: 8d4b1e6f2a93
+Create Date: 2026-10-15 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2c7f9a4e6b05"
+down_revision: Union[str, None] = "8d4b1e6f2a93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Buckets are UTC hours regardless of the session time zone
+    op.execute("""
+        CREATE MATERIALIZED VIEW agentexecutions_hourly AS
+        SELECT
+            user_id,
+            agent_id,
+            agent_name,
+            agent_type,
+            model_name,
+            date_trunc('hour', started_at, 'UTC') AS bucket,
+            count(*) AS executions,
+            count(*) FILTER (WHERE status = 'success') AS successful,
+            count(*) FILTER (WHERE status = 'failure') AS failed,
+            count(*) FILTER (WHERE status = 'timeout') AS timed_out,
+            sum(execution_time_ms) AS execution_time_ms,
+            percentile_cont(0.5) WITHIN GROUP (ORDER BY execution_time_ms) AS p50_execution_time_ms,
+            percentile_cont(0.95) WITHIN GROUP (ORDER BY execution_time_ms) AS p95_execution_time_ms,
+            sum(input_tokens) AS input_tokens,
+            sum(output_tokens) AS output_tokens,
+            sum(total_tokens) AS total_tokens,
+            sum(cost_micro_usd) AS cost_micro_usd
+        FROM agentexecutions
+        GROUP BY user_id, agent_id, agent_name, agent_type, model_name, bucket
+    """)
+    # REFRESH ... CONCURRENTLY needs a unique index over every row; the
+    # grouping columns are nullable, so NULLs must compare equal
+    op.execute("""
+        CREATE UNIQUE INDEX ix_agentexecutions_hourly_bucket
+        ON agentexecutions_hourly (user_id, bucket, agent_id, agent_name, agent_type, model_name)
+        NULLS NOT DISTINCT
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW agentexecutions_hourly")
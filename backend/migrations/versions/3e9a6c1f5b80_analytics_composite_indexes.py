@@ -0,0 +1,70 @@
+"""Replace single-column analytics indexes with composite ones
+
+Revision ID: 3e9a6c1f5b80
+Revises: 0b7c4f2e8d19
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3e9a6c1f5b80"
+down_revision: Union[str, None] = "0b7c4f2e8d19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each new index leads with the column of the index it replaces
+    op.create_index(
+        "ix_agentexecutions_agent_started",
+        "agentexecutions",
+        ["agent_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_include=["user_id", "status", "cost_micro_usd"],
+    )
+    op.drop_index(op.f("ix_agentexecutions_agent_id"), table_name="agentexecutions")
+
+    op.create_index(
+        "ix_tokenusages_execution_step",
+        "tokenusages",
+        ["execution_id", "step_number"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_tokenusages_execution_id"), table_name="tokenusages")
+
+    op.create_index(
+        "ix_executiontraces_execution_step",
+        "executiontraces",
+        ["execution_id", "step_number"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_executiontraces_execution_id"), table_name="executiontraces")
+
+    op.create_index(
+        "ix_analyticssnapshots_user_period_date",
+        "analyticssnapshots",
+        ["user_id", "period_type", "snapshot_date"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_analyticssnapshots_user_id"), table_name="analyticssnapshots")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_analyticssnapshots_user_id"), "analyticssnapshots", ["user_id"], unique=False)
+    op.drop_index("ix_analyticssnapshots_user_period_date", table_name="analyticssnapshots")
+
+    op.create_index(op.f("ix_executiontraces_execution_id"), "executiontraces", ["execution_id"], unique=False)
+    op.drop_index("ix_executiontraces_execution_step", table_name="executiontraces")
+
+    op.create_index(op.f("ix_tokenusages_execution_id"), "tokenusages", ["execution_id"], unique=False)
+    op.drop_index("ix_tokenusages_execution_step", table_name="tokenusages")
+
+    op.create_index(op.f("ix_agentexecutions_agent_id"), "agentexecutions", ["agent_id"], unique=False)
+    op.drop_index("ix_agentexecutions_agent_started", table_name="agentexecutions")
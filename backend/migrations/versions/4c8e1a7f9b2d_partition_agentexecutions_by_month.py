@@ -0,0 +1,155 @@
+"""Range partition agentexecutions by started_at month
+
+Revision ID: 4c8e1a7f9b2d
+Revises: b61f0e8d3a27
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from datetime import date, datetime
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8e1a7f9b2d"
+down_revision: Union[str, None] = "b61f0e8d3a27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Foreign keys that point at agentexecutions.id. A partitioned table can only
+# have unique constraints that include the partition key, so these cannot
+# be kept once the primary key becomes (id, started_at).
+INBOUND_FOREIGN_KEYS = (
+    ("tokenusages_execution_id_fkey", "tokenusages", "execution_id", "CASCADE"),
+    ("executiontraces_execution_id_fkey", "executiontraces", "execution_id", "CASCADE"),
+    ("agentexecutions_parent_execution_id_fkey", "agentexecutions", "parent_execution_id", "SET NULL"),
+)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _create_partitions(table: str, start: date, end: date) -> None:
+    """Create monthly partitions of `table` from `start` through `end`, and its default partition.
+
+    A frozen copy of the DDL in src.db.partitions, so this revision keeps
+    producing the same schema when that module changes.
+    """
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month} 00:00+00') TO ('{_next_month(month)} 00:00+00')"
+        )
+        month = _next_month(month)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("request_id", sa.UUID(), nullable=False),
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("agent_id", sa.UUID(), nullable=True),
+        sa.Column("agent_type", postgresql.ENUM(name="agenttype", create_type=False), nullable=True),
+        sa.Column("agent_name", sa.String(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("model_config_id", sa.UUID(), nullable=True),
+        sa.Column("model_name", sa.String(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("status", postgresql.ENUM(name="executionstatus", create_type=False), nullable=False),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("error_type", sa.String(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("execution_time_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("llm_time_ms", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("cost_micro_usd", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("parent_execution_id", sa.UUID(), nullable=True),
+        sa.Column("query_preview", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["model_config_id"], ["modelconfigs.id"], ondelete="SET NULL"),
+    ]
+
+
+def _create_indexes() -> None:
+    for column in ("id", "request_id", "session_id", "agent_id", "model_config_id", "parent_execution_id"):
+        op.create_index(f"ix_agentexecutions_{column}", "agentexecutions", [column], unique=False)
+    op.create_index(
+        "ix_agentexecutions_user_started",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_include=["status", "cost_micro_usd", "total_tokens", "execution_time_ms"],
+    )
+    op.create_index(
+        "ix_agentexecutions_failures",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("status IN ('failure', 'timeout')"),
+    )
+    op.create_index(
+        "ix_agentexecutions_started_brin",
+        "agentexecutions",
+        ["started_at"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def _drop_indexes() -> None:
+    for column in ("id", "request_id", "session_id", "agent_id", "model_config_id", "parent_execution_id"):
+        op.drop_index(f"ix_agentexecutions_{column}", table_name="agentexecutions")
+    for name in ("user_started", "failures", "started_brin"):
+        op.drop_index(f"ix_agentexecutions_{name}", table_name="agentexecutions")
+
+
+def _replace_table(primary_key: list[str], **table_kwargs) -> None:
+    """Rebuild agentexecutions with a new layout and copy its rows across."""
+    _drop_indexes()
+    op.rename_table("agentexecutions", "agentexecutions_old")
+    op.execute("ALTER TABLE agentexecutions_old RENAME CONSTRAINT agentexecutions_pkey TO agentexecutions_old_pkey")
+
+    columns = _columns()
+    op.create_table(
+        "agentexecutions",
+        *columns,
+        sa.PrimaryKeyConstraint(*primary_key, name="agentexecutions_pkey"),
+        **table_kwargs,
+    )
+    if "postgresql_partition_by" in table_kwargs:
+        first_started_at = op.get_bind().execute(
+            sa.text("SELECT min(started_at) FROM agentexecutions_old")
+        ).scalar()
+        today = datetime.utcnow().date()
+        start = first_started_at.date() if first_started_at else today
+        _create_partitions("agentexecutions", start, _next_month(today))
+
+    names = ", ".join(column.name for column in columns if isinstance(column, sa.Column))
+    op.execute(f"INSERT INTO agentexecutions ({names}) SELECT {names} FROM agentexecutions_old")
+    op.execute("DROP TABLE agentexecutions_old CASCADE")
+    _create_indexes()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, _, _ in INBOUND_FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_="foreignkey")
+    _replace_table(["id", "started_at"], postgresql_partition_by="RANGE (started_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_table(["id"])
+    for name, table, column, ondelete in INBOUND_FOREIGN_KEYS:
+        op.create_foreign_key(name, table, "agentexecutions", [column], ["id"], ondelete=ondelete)
@@ -0,0 +1,76 @@
+"""Use native enums for analytics categorical columns
+
+Revision ID: 5d9a0e6c21f8
+Revises: c7e2f19a4b3d
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5d9a0e6c21f8"
+down_revision: Union[str, None] = "c7e2f19a4b3d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+agent_type_enum = postgresql.ENUM(
+    "genai", "flow", "mcp", "a2a", name="agenttype", create_type=False
+)
+snapshot_period_type_enum = postgresql.ENUM(
+    "hourly", "daily", "weekly", "monthly", name="snapshotperiodtype", create_type=False
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    agent_type_enum.create(op.get_bind(), checkfirst=True)
+    snapshot_period_type_enum.create(op.get_bind(), checkfirst=True)
+
+    # Values outside the enum cannot be represented and are dropped to NULL
+    op.alter_column(
+        "agentexecutions",
+        "agent_type",
+        existing_type=sa.String(),
+        type_=agent_type_enum,
+        existing_nullable=True,
+        postgresql_using=(
+            "CASE WHEN agent_type IN ('genai', 'flow', 'mcp', 'a2a') "
+            "THEN agent_type::agenttype END"
+        ),
+    )
+    op.alter_column(
+        "analyticssnapshots",
+        "period_type",
+        existing_type=sa.String(),
+        type_=snapshot_period_type_enum,
+        existing_nullable=False,
+        postgresql_using="period_type::snapshotperiodtype",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "analyticssnapshots",
+        "period_type",
+        existing_type=snapshot_period_type_enum,
+        type_=sa.String(),
+        existing_nullable=False,
+        postgresql_using="period_type::text",
+    )
+    op.alter_column(
+        "agentexecutions",
+        "agent_type",
+        existing_type=agent_type_enum,
+        type_=sa.String(),
+        existing_nullable=True,
+        postgresql_using="agent_type::text",
+    )
+
+    snapshot_period_type_enum.drop(op.get_bind(), checkfirst=True)
+    agent_type_enum.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,55 @@
+"""Store budget spend and snapshot costs as BIGINT micro-dollars
+
+Revision ID: 5f1c8b3d7a24
+Revises: 2c7f9a4e6b05
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f1c8b3d7a24"
+down_revision: Union[str, None] = "2c7f9a4e6b05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (old NUMERIC column, new micro-dollar column). budgetalerts.threshold_usd
+# is user input and stays NUMERIC(10,2)
+COST_COLUMNS = {
+    "budgetalerts": ("current_spend_usd", "current_spend_micro_usd"),
+    "analyticssnapshots": ("total_cost_usd", "total_cost_micro_usd"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (old_name, new_name) in COST_COLUMNS.items():
+        op.alter_column(table, old_name, server_default=None)
+        op.alter_column(
+            table,
+            old_name,
+            existing_type=sa.Numeric(precision=10, scale=2),
+            type_=sa.BigInteger(),
+            postgresql_using=f"round({old_name} * 1000000)::bigint",
+            new_column_name=new_name,
+        )
+        op.alter_column(table, new_name, server_default="0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (old_name, new_name) in COST_COLUMNS.items():
+        op.alter_column(table, new_name, server_default=None)
+        op.alter_column(
+            table,
+            new_name,
+            existing_type=sa.BigInteger(),
+            type_=sa.Numeric(precision=10, scale=2),
+            postgresql_using=f"round({new_name} / 1000000.0, 2)",
+            new_column_name=old_name,
+        )
+        op.alter_column(table, old_name, server_default="0.00")
@@ -0,0 +1,39 @@
+"""BRIN index on tokenusages.created_at
+
+Revision ID: 6a0d2f8c4e17
+Revises: 3e9a6c1f5b80
+Create Date: 2026-10-15 15:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6a0d2f8c4e17"
+down_revision: Union[str, None] = "3e9a6c1f5b80"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_tokenusages_created_at_brin",
+        "tokenusages",
+        ["created_at"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_tokenusages_created_at_brin",
+        table_name="tokenusages",
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
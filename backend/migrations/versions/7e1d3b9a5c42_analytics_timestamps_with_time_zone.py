@@ -0,0 +1,163 @@
+"""Store analytics timestamps as TIMESTAMPTZ
+
+Revision ID: 7e1d3b9a5c42
+Revises: d2a5c9e7f314
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "7e1d3b9a5c42"
+down_revision: Union[str, None] = "d2a5c9e7f314"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing values were written as UTC wall-clock times
+TIMESTAMP_COLUMNS = {
+    "tokenusages": ("created_at",),
+    "executiontraces": ("timestamp",),
+    "budgetalerts": ("last_alert_sent_at", "created_at", "updated_at"),
+    "analyticssnapshots": ("snapshot_date", "created_at"),
+}
+EXECUTION_TIMESTAMP_COLUMNS = ("started_at", "completed_at", "created_at", "updated_at")
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _create_partitions(table: str, start: date, end: date) -> None:
+    """Create monthly partitions of `table` from `start` through `end`, and its default partition."""
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month} 00:00+00') TO ('{_next_month(month)} 00:00+00')"
+        )
+        month = _next_month(month)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _execution_columns(with_timezone: bool) -> list[sa.Column]:
+    timestamp = sa.DateTime(timezone=with_timezone)
+    return [
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("request_id", sa.UUID(), nullable=False),
+        sa.Column("session_id", sa.UUID(), nullable=False),
+        sa.Column("agent_id", sa.UUID(), nullable=True),
+        sa.Column("agent_type", postgresql.ENUM(name="agenttype", create_type=False), nullable=True),
+        sa.Column("agent_name", sa.String(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("model_config_id", sa.UUID(), nullable=True),
+        sa.Column("model_name", sa.String(), nullable=True),
+        sa.Column("started_at", timestamp, server_default=sa.text("now()"), nullable=False),
+        sa.Column("completed_at", timestamp, nullable=True),
+        sa.Column("status", postgresql.ENUM(name="executionstatus", create_type=False), nullable=False),
+        sa.Column("error_message", sa.String(), nullable=True),
+        sa.Column("error_type", sa.String(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("execution_time_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("llm_time_ms", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("cost_micro_usd", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("parent_execution_id", sa.UUID(), nullable=True),
+        sa.Column("query_preview", sa.String(), nullable=True),
+        sa.Column("created_at", timestamp, server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", timestamp, server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["model_config_id"], ["modelconfigs.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id", "started_at", name="agentexecutions_pkey"),
+    ]
+
+
+def _create_execution_indexes() -> None:
+    for column in ("request_id", "session_id", "agent_id", "model_config_id", "parent_execution_id"):
+        op.create_index(f"ix_agentexecutions_{column}", "agentexecutions", [column], unique=False)
+    op.create_index(
+        "ix_agentexecutions_user_started",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_include=["status", "cost_micro_usd", "total_tokens", "execution_time_ms"],
+    )
+    op.create_index(
+        "ix_agentexecutions_failures",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("status IN ('failure', 'timeout')"),
+    )
+    op.create_index(
+        "ix_agentexecutions_started_brin",
+        "agentexecutions",
+        ["started_at"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def _rebuild_agentexecutions(with_timezone: bool) -> None:
+    """Recreate the partitioned table with the new timestamp type.
+
+    Postgres refuses to change the type of a partition key column, so the
+    rows are parked in a temporary table while the parent is rebuilt.
+    """
+    op.execute("CREATE TEMPORARY TABLE agentexecutions_copy AS SELECT * FROM agentexecutions")
+    op.execute("DROP TABLE agentexecutions CASCADE")
+
+    columns = _execution_columns(with_timezone)
+    op.create_table("agentexecutions", *columns, postgresql_partition_by="RANGE (started_at)")
+
+    first_started_at = op.get_bind().execute(
+        sa.text("SELECT min(started_at) FROM agentexecutions_copy")
+    ).scalar()
+    today = datetime.now(timezone.utc).date()
+    start = first_started_at.date() if first_started_at else today
+    _create_partitions("agentexecutions", start, _next_month(today))
+
+    conversion = "{0} AT TIME ZONE 'UTC'"
+    names = [column.name for column in columns if isinstance(column, sa.Column)]
+    values = [conversion.format(name) if name in EXECUTION_TIMESTAMP_COLUMNS else name for name in names]
+    op.execute(
+        f"INSERT INTO agentexecutions ({', '.join(names)}) "
+        f"SELECT {', '.join(values)} FROM agentexecutions_copy"
+    )
+    op.execute("DROP TABLE agentexecutions_copy")
+    _create_execution_indexes()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(),
+                type_=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
+    _rebuild_agentexecutions(with_timezone=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild_agentexecutions(with_timezone=False)
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                type_=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            )
@@ -0,0 +1,130 @@
+"""Range partition tokenusages and executiontraces by month
+
+Revision ID: 8d4b1e6f2a93
+Revises: 6a0d2f8c4e17
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4b1e6f2a93"
+down_revision: Union[str, None] = "6a0d2f8c4e17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _create_partitions(table: str, start: date, end: date) -> None:
+    """Create monthly partitions of `table` from `start` through `end`, and its default partition."""
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month} 00:00+00') TO ('{_next_month(month)} 00:00+00')"
+        )
+        month = _next_month(month)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _token_usage_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), server_default=sa.text("uuid_generate_v7()"), nullable=False),
+        sa.Column("execution_id", sa.UUID(), nullable=False),
+        sa.Column("component", sa.String(), nullable=False),
+        sa.Column("step_number", sa.Integer(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("model", sa.String(), nullable=True),
+        sa.Column("cost_micro_usd", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    ]
+
+
+def _trace_columns() -> list[sa.Column]:
+    return [
+        sa.Column("id", sa.UUID(), server_default=sa.text("uuid_generate_v7()"), nullable=False),
+        sa.Column("execution_id", sa.UUID(), nullable=False),
+        sa.Column("step_number", sa.Integer(), nullable=False),
+        sa.Column(
+            "step_type",
+            postgresql.ENUM(name="executiontracesteptype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("content", sa.String(), nullable=True),
+        sa.Column("invoked_agent_id", sa.UUID(), nullable=True),
+        sa.Column("invoked_agent_name", sa.String(), nullable=True),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.Integer(), nullable=True, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=True, server_default="0"),
+    ]
+
+
+# table -> (column factory, partition key, BRIN index name)
+TABLES = {
+    "tokenusages": (_token_usage_columns, "created_at", "ix_tokenusages_created_at_brin"),
+    "executiontraces": (_trace_columns, "timestamp", "ix_executiontraces_timestamp_brin"),
+}
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Recreate `table` with or without monthly partitions and copy its rows across.
+
+    An existing table cannot be turned into a partitioned one in place, so
+    the rows are parked in a temporary table while it is rebuilt.
+    """
+    columns, partition_key, brin_index = TABLES[table]
+    op.execute(f"CREATE TEMPORARY TABLE {table}_copy AS SELECT * FROM {table}")
+    op.execute(f"DROP TABLE {table}")
+
+    if partitioned:
+        op.create_table(
+            table,
+            *columns(),
+            sa.PrimaryKeyConstraint("id", partition_key, name=f"{table}_pkey"),
+            postgresql_partition_by=f'RANGE ("{partition_key}")',
+        )
+        first = op.get_bind().execute(
+            sa.text(f'SELECT min("{partition_key}") FROM {table}_copy')
+        ).scalar()
+        today = datetime.now(timezone.utc).date()
+        start = first.date() if first else today
+        _create_partitions(table, start, _next_month(today))
+    else:
+        op.create_table(table, *columns(), sa.PrimaryKeyConstraint("id", name=f"{table}_pkey"))
+
+    names = ", ".join(f'"{column.name}"' for column in columns())
+    op.execute(f"INSERT INTO {table} ({names}) SELECT {names} FROM {table}_copy")
+    op.execute(f"DROP TABLE {table}_copy")
+
+    op.create_index(f"ix_{table}_execution_step", table, ["execution_id", "step_number"], unique=False)
+    op.create_index(
+        brin_index,
+        table,
+        [partition_key],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        _rebuild(table, partitioned=False)
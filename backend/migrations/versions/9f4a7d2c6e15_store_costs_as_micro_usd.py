@@ -0,0 +1,52 @@
+"""Store execution and token usage costs as BIGINT micro-dollars
+
+Revision ID: 9f4a7d2c6e15
+Revises: e3b8c4d1a9f0
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9f4a7d2c6e15"
+down_revision: Union[str, None] = "e3b8c4d1a9f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COST_TABLES = ("agentexecutions", "tokenusages")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 8-byte integers instead of NUMERIC(10,6): fixed width on disk and
+    # SUM() over them avoids arbitrary-precision arithmetic
+    for table in COST_TABLES:
+        op.alter_column(table, "cost_usd", server_default=None)
+        op.alter_column(
+            table,
+            "cost_usd",
+            existing_type=sa.Numeric(precision=10, scale=6),
+            type_=sa.BigInteger(),
+            postgresql_using="round(cost_usd * 1000000)::bigint",
+            new_column_name="cost_micro_usd",
+        )
+        op.alter_column(table, "cost_micro_usd", server_default="0")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in COST_TABLES:
+        op.alter_column(table, "cost_micro_usd", server_default=None)
+        op.alter_column(
+            table,
+            "cost_micro_usd",
+            existing_type=sa.BigInteger(),
+            type_=sa.Numeric(precision=10, scale=6),
+            postgresql_using="cost_micro_usd / 1000000.0",
+            new_column_name="cost_usd",
+        )
+        op.alter_column(table, "cost_usd", server_default="0.000000")
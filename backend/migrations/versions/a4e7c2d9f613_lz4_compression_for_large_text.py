@@ -0,0 +1,58 @@
+"""Compress large text columns with lz4
+
+Revision ID: a4e7c2d9f613
+Revises: 5f1c8b3d7a24
+Create Date: 2026-10-15 17:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e7c2d9f613"
+down_revision: Union[str, None] = "5f1c8b3d7a24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Free-form text that regularly outgrows the TOAST threshold. lz4
+# decompresses several times faster than the default pglz, which is paid
+# on every read of these columns
+TEXT_COLUMNS = (
+    ("chatmessages", "content"),
+    ("logs", "message"),
+    ("executiontraces", "content"),
+    ("agentexecutions", "error_message"),
+)
+
+
+def _set_compression(method: str) -> None:
+    bind = op.get_bind()
+    # Only listed when the server was built with lz4 support
+    supported = bind.execute(
+        sa.text("SELECT enumvals FROM pg_settings WHERE name = 'default_toast_compression'")
+    ).scalar()
+    if method != "default" and method not in supported:
+        return
+
+    for table, column in TEXT_COLUMNS:
+        # New partitions copy the parent's setting, existing ones need their own ALTER
+        partitions = bind.execute(
+            sa.text("SELECT inhrelid::regclass::text FROM pg_inherits WHERE inhparent = CAST(:table AS regclass)"),
+            {"table": table},
+        ).scalars()
+        for name in (table, *partitions):
+            op.execute(f"ALTER TABLE {name} ALTER COLUMN {column} SET COMPRESSION {method}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Applies to values written from now on; existing rows keep pglz until rewritten
+    _set_compression("lz4")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _set_compression("default")
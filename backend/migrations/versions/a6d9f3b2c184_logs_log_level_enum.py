@@ -0,0 +1,45 @@
+"""Store logs.log_level as a native enum
+
+Revision ID: a6d9f3b2c184
+Revises: f2b8d6e4a179
+Create Date: 2026-10-15 21:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d9f3b2c184"
+down_revision: Union[str, None] = "f2b8d6e4a179"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+loglevel = sa.Enum("debug", "info", "warning", "error", "critical", name="loglevel")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    loglevel.create(op.get_bind())
+    op.alter_column(
+        "logs",
+        "log_level",
+        existing_type=sa.VARCHAR(),
+        type_=loglevel,
+        existing_nullable=False,
+        postgresql_using="lower(log_level)::loglevel",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column(
+        "logs",
+        "log_level",
+        existing_type=loglevel,
+        type_=sa.VARCHAR(),
+        existing_nullable=False,
+    )
+    loglevel.drop(op.get_bind())
@@ -0,0 +1,54 @@
+"""Store budget alert period and percentage as SMALLINT with checks
+
+Revision ID: a8f2e6b4d071
+Revises: 7e1d3b9a5c42
+Create Date: 2026-10-15 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8f2e6b4d071"
+down_revision: Union[str, None] = "7e1d3b9a5c42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in ("period_days", "alert_at_percentage"):
+        op.alter_column(
+            "budgetalerts",
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            existing_nullable=False,
+        )
+    op.create_check_constraint(
+        "ck_budgetalerts_alert_at_percentage",
+        "budgetalerts",
+        "alert_at_percentage BETWEEN 1 AND 100",
+    )
+    op.create_check_constraint(
+        "ck_budgetalerts_period_days",
+        "budgetalerts",
+        "period_days > 0",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ck_budgetalerts_period_days", "budgetalerts", type_="check")
+    op.drop_constraint("ck_budgetalerts_alert_at_percentage", "budgetalerts", type_="check")
+    for column in ("period_days", "alert_at_percentage"):
+        op.alter_column(
+            "budgetalerts",
+            column,
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,41 @@
+"""Generate token usage and trace ids server-side
+
+Revision ID: b61f0e8d3a27
+Revises: 9f4a7d2c6e15
+Create Date: 2026-10-15 11:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b61f0e8d3a27"
+down_revision: Union[str, None] = "9f4a7d2c6e15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # gen_random_uuid() is built in since PG 13, no pgcrypto needed
+    for table in ("tokenusages", "executiontraces"):
+        op.alter_column(
+            table,
+            "id",
+            existing_type=sa.UUID(),
+            server_default=sa.text("gen_random_uuid()"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("tokenusages", "executiontraces"):
+        op.alter_column(
+            table,
+            "id",
+            existing_type=sa.UUID(),
+            server_default=None,
+        )
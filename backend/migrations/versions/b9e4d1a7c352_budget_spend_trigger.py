@@ -0,0 +1,71 @@
+"""Maintain budgetalerts.current_spend_micro_usd with a trigger
+
+Revision ID: b9e4d1a7c352
+Revises: f7d3e5a1b846
+Create Date: 2026-10-15 19:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e4d1a7c352"
+down_revision: Union[str, None] = "f7d3e5a1b846"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_budgetalerts_user_id", table_name="budgetalerts")
+    op.create_index(
+        "ix_budgetalerts_user_id_active",
+        "budgetalerts",
+        ["user_id"],
+        unique=False,
+        postgresql_where=sa.text("is_active"),
+    )
+    # Adds the cost delta of each written execution to the owner's active
+    # alerts in scope. Executions older than an alert's window are ignored;
+    # spend that ages out of the window is removed by the periodic resync.
+    op.execute("""
+        CREATE FUNCTION budgetalerts_add_execution_cost() RETURNS trigger AS $$
+        DECLARE
+            delta bigint := NEW.cost_micro_usd;
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                delta := delta - OLD.cost_micro_usd;
+            END IF;
+            IF delta <> 0 AND NEW.user_id IS NOT NULL THEN
+                UPDATE budgetalerts
+                SET current_spend_micro_usd = current_spend_micro_usd + delta
+                WHERE user_id = NEW.user_id
+                  AND is_active
+                  AND NEW.started_at >= now() - make_interval(days => period_days)
+                  AND (scope <> 'agent' OR scope_id IS NULL OR scope_id = NEW.agent_id);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Defined on the partitioned parent, so every partition inherits it
+    op.execute("""
+        CREATE TRIGGER agentexecutions_budget_spend
+        AFTER INSERT OR UPDATE OF cost_micro_usd ON agentexecutions
+        FOR EACH ROW EXECUTE FUNCTION budgetalerts_add_execution_cost()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER agentexecutions_budget_spend ON agentexecutions")
+    op.execute("DROP FUNCTION budgetalerts_add_execution_cost()")
+    op.drop_index(
+        "ix_budgetalerts_user_id_active",
+        table_name="budgetalerts",
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index("ix_budgetalerts_user_id", "budgetalerts", ["user_id"], unique=False)
@@ -0,0 +1,45 @@
+"""Cover agent_id and model_name in ix_agentexecutions_user_started
+
+Revision ID: c3f7a9e2d518
+Revises: a6d9f3b2c184
+Create Date: 2026-10-15 22:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f7a9e2d518"
+down_revision: Union[str, None] = "a6d9f3b2c184"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INCLUDED = ["status", "cost_micro_usd", "total_tokens", "execution_time_ms"]
+
+
+def _recreate_user_started(include: list[str]) -> None:
+    # Postgres cannot build an index on a partitioned table CONCURRENTLY, so
+    # the index is rebuilt in place on every partition
+    op.drop_index("ix_agentexecutions_user_started", table_name="agentexecutions")
+    op.create_index(
+        "ix_agentexecutions_user_started",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_include=include,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The overview, cost summary and budget queries also group or filter by
+    # agent and model; keep those in the leaf pages for index-only scans
+    _recreate_user_started([*INCLUDED, "agent_id", "model_name"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_user_started(INCLUDED)
@@ -0,0 +1,51 @@
+"""Use composite primary keys on the association tables
+
+Revision ID: c3f8a1d6e290
+Revises: a4e7c2d9f613
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d6e290"
+down_revision: Union[str, None] = "a4e7c2d9f613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (leading key column, trailing key column)
+ASSOCIATION_TABLES = {
+    "user_project_associations": ("user_id", "project_id"),
+    "user_team_associations": ("user_id", "team_id"),
+    "agent_project_associations": ("agent_id", "project_id"),
+    "agentflow_project_associations": ("flow_id", "project_id"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, (first, second) in ASSOCIATION_TABLES.items():
+        # Keep one row per pair before the pair becomes the key
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.{first} = b.{first} AND a.{second} = b.{second} AND a.id > b.id"
+        )
+        op.drop_index(op.f(f"ix_{table}_id"), table_name=table)
+        op.drop_index(op.f(f"ix_{table}_{first}"), table_name=table)
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.drop_column(table, "id")
+        op.create_primary_key(f"{table}_pkey", table, [first, second])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (first, _) in ASSOCIATION_TABLES.items():
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.add_column(table, sa.Column("id", sa.Integer(), sa.Identity(), nullable=False))
+        op.create_primary_key(f"{table}_pkey", table, ["id"])
+        op.create_index(op.f(f"ix_{table}_id"), table, ["id"], unique=False)
+        op.create_index(op.f(f"ix_{table}_{first}"), table, [first], unique=False)
@@ -0,0 +1,49 @@
+"""Add covering indexes for analytics queries
+
+Revision ID: c7e2f19a4b3d
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2f19a4b3d"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Dashboard aggregates filter by user + time range; INCLUDE keeps the
+    # aggregated columns in the leaf pages for index-only scans
+    op.create_index(
+        "ix_agentexecutions_user_started",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_include=["status", "cost_usd", "total_tokens", "execution_time_ms"],
+    )
+    op.create_index(
+        "ix_agentexecutions_failures",
+        "agentexecutions",
+        ["user_id", sa.text("started_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("status IN ('failure', 'timeout')"),
+    )
+    # Leading column of ix_agentexecutions_user_started
+    op.drop_index(op.f("ix_agentexecutions_user_id"), table_name="agentexecutions")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        op.f("ix_agentexecutions_user_id"), "agentexecutions", ["user_id"], unique=False
+    )
+    op.drop_index("ix_agentexecutions_failures", table_name="agentexecutions")
+    op.drop_index("ix_agentexecutions_user_started", table_name="agentexecutions")
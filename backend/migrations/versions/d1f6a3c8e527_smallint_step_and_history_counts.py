@@ -0,0 +1,50 @@
+"""Store step numbers and chat history length as SMALLINT
+
+Revision ID: d1f6a3c8e527
+Revises: b9e4d1a7c352
+Create Date: 2026-10-15 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d1f6a3c8e527"
+down_revision: Union[str, None] = "b9e4d1a7c352"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, nullable). Altering a partitioned parent rewrites every
+# partition along with it.
+SMALLINT_COLUMNS = (
+    ("tokenusages", "step_number", True),
+    ("executiontraces", "step_number", False),
+    ("modelconfigs", "max_last_messages", False),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, nullable in SMALLINT_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Integer(),
+            type_=sa.SmallInteger(),
+            existing_nullable=nullable,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, nullable in SMALLINT_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.SmallInteger(),
+            type_=sa.Integer(),
+            existing_nullable=nullable,
+        )
@@ -0,0 +1,39 @@
+"""Drop ix_<table>_id indexes duplicated by the analytics primary keys
+
+Revision ID: d2a5c9e7f314
+Revises: 4c8e1a7f9b2d
+Create Date: 2026-10-15 12:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a5c9e7f314"
+down_revision: Union[str, None] = "4c8e1a7f9b2d"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = (
+    "agentexecutions",
+    "tokenusages",
+    "executiontraces",
+    "budgetalerts",
+    "analyticssnapshots",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The primary key index (led by id on agentexecutions) already serves
+    # lookups by id; these only cost extra writes
+    for table in TABLES:
+        op.drop_index(op.f(f"ix_{table}_id"), table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.create_index(op.f(f"ix_{table}_id"), table, ["id"], unique=False)
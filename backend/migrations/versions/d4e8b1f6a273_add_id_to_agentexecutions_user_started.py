@@ -0,0 +1,52 @@
+"""Add id to the ix_agentexecutions_user_started key
+
+Revision ID: d4e8b1f6a273
+Revises: c3f7a9e2d518
+Create Date: 2026-10-15 23:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d4e8b1f6a273"
+down_revision: Union[str, None] = "c3f7a9e2d518"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INCLUDED = [
+    "status",
+    "cost_micro_usd",
+    "total_tokens",
+    "execution_time_ms",
+    "agent_id",
+    "model_name",
+]
+
+
+def _recreate_user_started(columns: list) -> None:
+    # Postgres cannot build an index on a partitioned table CONCURRENTLY, so
+    # the index is rebuilt in place on every partition
+    op.drop_index("ix_agentexecutions_user_started", table_name="agentexecutions")
+    op.create_index(
+        "ix_agentexecutions_user_started",
+        "agentexecutions",
+        columns,
+        unique=False,
+        postgresql_include=INCLUDED,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The executions list orders and seeks on (started_at, id); with id in
+    # the key a cursor page is a single index range scan with no sort
+    _recreate_user_started(["user_id", sa.text("started_at DESC"), sa.text("id DESC")])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate_user_started(["user_id", sa.text("started_at DESC")])
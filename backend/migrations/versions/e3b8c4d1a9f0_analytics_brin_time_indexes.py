@@ -0,0 +1,65 @@
+"""Add BRIN indexes on analytics time columns
+
+Revision ID: e3b8c4d1a9f0
+Revises: 5d9a0e6c21f8
+Create Date: 2026-10-15 10:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b8c4d1a9f0"
+down_revision: Union[str, None] = "5d9a0e6c21f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Append-mostly timestamps: BRIN keeps min/max per block range and is a
+    # fraction of the size of a B-tree for time-range scans
+    op.create_index(
+        "ix_agentexecutions_started_brin",
+        "agentexecutions",
+        ["started_at"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+    op.create_index(
+        "ix_executiontraces_timestamp_brin",
+        "executiontraces",
+        ["timestamp"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+    op.drop_index(
+        op.f("ix_analyticssnapshots_snapshot_date"), table_name="analyticssnapshots"
+    )
+    op.create_index(
+        "ix_analyticssnapshots_snapshot_date_brin",
+        "analyticssnapshots",
+        ["snapshot_date"],
+        unique=False,
+        postgresql_using="brin",
+        postgresql_with={"pages_per_range": 32},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_analyticssnapshots_snapshot_date_brin", table_name="analyticssnapshots"
+    )
+    op.create_index(
+        op.f("ix_analyticssnapshots_snapshot_date"),
+        "analyticssnapshots",
+        ["snapshot_date"],
+        unique=False,
+    )
+    op.drop_index("ix_executiontraces_timestamp_brin", table_name="executiontraces")
+    op.drop_index("ix_agentexecutions_started_brin", table_name="agentexecutions")
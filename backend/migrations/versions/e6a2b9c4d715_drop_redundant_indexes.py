@@ -0,0 +1,67 @@
+"""Drop indexes that duplicate primary keys or composite indexes
+
+Revision ID: e6a2b9c4d715
+Revises: c3f8a1d6e290
+Create Date: 2026-10-15 18:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a2b9c4d715"
+down_revision: Union[str, None] = "c3f8a1d6e290"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column) of single-column indexes that are redundant:
+# - ix_<table>_id and ix_chatconversations_session_id repeat the primary key index
+# - creator_id leads the per-user unique constraint on the same table
+# - parent_execution_id lost its foreign key and nothing filters on it
+REDUNDANT_INDEXES = (
+    ("a2acards", "id"),
+    ("agents", "id"),
+    ("agentworkflows", "id"),
+    ("chatmessages", "id"),
+    ("files", "id"),
+    ("logs", "id"),
+    ("mcpservers", "id"),
+    ("mcptools", "id"),
+    ("modelconfigs", "id"),
+    ("modelproviders", "id"),
+    ("projects", "id"),
+    ("teams", "id"),
+    ("userprofiles", "id"),
+    ("users", "id"),
+    ("chatconversations", "session_id"),
+    ("a2acards", "creator_id"),
+    ("mcpservers", "creator_id"),
+    ("modelproviders", "creator_id"),
+    ("agentexecutions", "parent_execution_id"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in REDUNDANT_INDEXES:
+        op.drop_index(op.f(f"ix_{table}_{column}"), table_name=table)
+
+    # Chat history is read per conversation ordered by created_at
+    op.create_index(
+        "ix_chatmessages_conversation_created",
+        "chatmessages",
+        ["conversation_id", "created_at"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_chatmessages_conversation_id"), table_name="chatmessages")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_chatmessages_conversation_id"), "chatmessages", ["conversation_id"], unique=False)
+    op.drop_index("ix_chatmessages_conversation_created", table_name="chatmessages")
+
+    for table, column in REDUNDANT_INDEXES:
+        op.create_index(op.f(f"ix_{table}_{column}"), table, [column], unique=False)
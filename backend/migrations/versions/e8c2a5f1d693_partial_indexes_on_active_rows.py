@@ -0,0 +1,49 @@
+"""Partial indexes over active agents, flows, MCP servers and A2A cards
+
+Revision ID: e8c2a5f1d693
+Revises: d1f6a3c8e527
+Create Date: 2026-10-15 20:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c2a5f1d693"
+down_revision: Union[str, None] = "d1f6a3c8e527"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, indexed columns). Listings filter on creator_id and is_active,
+# and most of them page through the result newest first.
+ACTIVE_ROW_INDEXES = (
+    ("agents", ["creator_id", sa.text("created_at DESC")]),
+    ("agentworkflows", ["creator_id"]),
+    ("mcpservers", ["creator_id", sa.text("created_at DESC")]),
+    ("a2acards", ["creator_id", sa.text("created_at DESC")]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, columns in ACTIVE_ROW_INDEXES:
+        op.create_index(
+            f"ix_{table}_creator_active",
+            table,
+            columns,
+            unique=False,
+            postgresql_where=sa.text("is_active"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, _ in ACTIVE_ROW_INDEXES:
+        op.drop_index(
+            f"ix_{table}_creator_active",
+            table_name=table,
+            postgresql_where=sa.text("is_active"),
+        )
@@ -0,0 +1,54 @@
+"""Unique snapshot buckets and server-generated snapshot ids
+
+Revision ID: f2b8d6e4a179
+Revises: e8c2a5f1d693
+Create Date: 2026-10-15 21:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d6e4a179"
+down_revision: Union[str, None] = "e8c2a5f1d693"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "analyticssnapshots",
+        "id",
+        existing_type=sa.UUID(),
+        server_default=sa.text("uuid_generate_v7()"),
+    )
+    # The unique index leads with the same columns, so it takes over the
+    # lookups of the plain one
+    op.drop_index("ix_analyticssnapshots_user_period_date", table_name="analyticssnapshots")
+    op.create_unique_constraint(
+        "uq_analyticssnapshots_bucket",
+        "analyticssnapshots",
+        ["user_id", "period_type", "snapshot_date", "agent_id", "model_name"],
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_analyticssnapshots_bucket", "analyticssnapshots", type_="unique")
+    op.create_index(
+        "ix_analyticssnapshots_user_period_date",
+        "analyticssnapshots",
+        ["user_id", "period_type", "snapshot_date"],
+        unique=False,
+    )
+    op.alter_column(
+        "analyticssnapshots",
+        "id",
+        existing_type=sa.UUID(),
+        server_default=None,
+    )
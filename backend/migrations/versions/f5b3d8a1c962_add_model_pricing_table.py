@@ -0,0 +1,57 @@
+"""Add modelpricings reference table
+
+Revision ID: f5b3d8a1c962
+Revises: a8f2e6b4d071
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+
+from decimal import Decimal
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5b3d8a1c962"
+down_revision: Union[str, None] = "a8f2e6b4d071"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# USD per 1K tokens (input, output)
+INITIAL_PRICES = {
+    "gpt-4o": ("0.005", "0.015"),
+    "gpt-4o-mini": ("0.00015", "0.0006"),
+    "claude-3-5-sonnet": ("0.003", "0.015"),
+    "claude-3-haiku": ("0.00025", "0.00125"),
+    "gemini-1.5-pro": ("0.00125", "0.005"),
+    "gemini-1.5-flash": ("0.000075", "0.0003"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    model_pricing = op.create_table(
+        "modelpricings",
+        sa.Column("model_name", sa.String(), nullable=False),
+        sa.Column("input_cost_per_1k", sa.Numeric(precision=12, scale=8), nullable=False),
+        sa.Column("output_cost_per_1k", sa.Numeric(precision=12, scale=8), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("model_name"),
+    )
+    op.bulk_insert(
+        model_pricing,
+        [
+            {
+                "model_name": name,
+                "input_cost_per_1k": Decimal(input_cost),
+                "output_cost_per_1k": Decimal(output_cost),
+            }
+            for name, (input_cost, output_cost) in INITIAL_PRICES.items()
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("modelpricings")
@@ -0,0 +1,45 @@
+"""Use hash indexes for equality-only UUID lookups
+
+Revision ID: f7d3e5a1b846
+Revises: e6a2b9c4d715
+Create Date: 2026-10-15 19:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7d3e5a1b846"
+down_revision: Union[str, None] = "e6a2b9c4d715"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Random UUID columns that are only ever compared with =
+HASH_INDEXED_COLUMNS = (
+    ("logs", "session_id"),
+    ("logs", "request_id"),
+    ("files", "session_id"),
+    ("files", "request_id"),
+    ("files", "internal_id"),
+    ("agentexecutions", "request_id"),
+    ("agentexecutions", "session_id"),
+)
+
+
+def _recreate(using: str) -> None:
+    for table, column in HASH_INDEXED_COLUMNS:
+        name = f"ix_{table}_{column}"
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, [column], unique=False, postgresql_using=using)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate("hash")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate("btree")
@@ -20,6 +20,14 @@ celery_app.conf.beat_schedule = {
         # schedule expects seconds
         "schedule": settings.CELERY_BEAT_INTERVAL_MINUTES * 60,
     },
+    "analytics-partition-maintenance": {
+        "task": "src.celery.tasks.singleton_analytics_partition_maintenance",
+        "schedule": 24 * 60 * 60,
+    },
+    "analytics-rollup-refresh": {
+        "task": "src.celery.tasks.singleton_analytics_rollup_refresh",
+        "schedule": settings.ANALYTICS_ROLLUP_REFRESH_MINUTES * 60,
+    },
 }
 celery_app.conf.timezone = "UTC"
 celery_app.autodiscover_tasks()
@@ -1,12 +1,34 @@
 import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
 
 from celery_singleton import Singleton
 from src.celery.celery_app import celery_app
+from src.core.settings import get_settings
+from src.db.partitions import drop_partitions_before, ensure_partitions, next_month
+from src.db.rollups import refresh_budget_spend, refresh_daily_snapshots, refresh_execution_rollup
+from src.db.session import async_session, engine
 from src.utils.lookup_a2a_agent import lookup_a2a_agents
 from src.utils.lookup_mcp_server import lookup_mcp_servers
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def run_async(coro):
+    """Run `coro` on a fresh event loop.
+
+    asyncpg connections belong to the loop that opened them, so the pool is
+    emptied before asyncio.run closes the loop.
+    """
+
+    async def _run():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_run())
 
 
 async def refresh_mcp_a2a_data():
@@ -19,4 +41,38 @@ async def refresh_mcp_a2a_data():
 
 @celery_app.task(base=Singleton, bind=True)
 def singleton_mcp_a2a_lookup(self):
-    asyncio.run(refresh_mcp_a2a_data())
+    run_async(refresh_mcp_a2a_data())
+
+
+async def maintain_analytics_partitions():
+    # Keep the current and next month's partitions in place so inserts never
+    # fall through to the default partition
+    now = datetime.now(timezone.utc)
+    async with async_session() as db:
+        await ensure_partitions(db, now.date(), next_month(now.date()))
+        if settings.ANALYTICS_RETENTION_DAYS > 0:
+            cutoff = now - timedelta(days=settings.ANALYTICS_RETENTION_DAYS)
+            dropped = await drop_partitions_before(db, cutoff)
+            if dropped:
+                logger.info(f"Dropped analytics partitions: {', '.join(dropped)}")
+        await db.commit()
+
+
+@celery_app.task(base=Singleton, bind=True)
+def singleton_analytics_partition_maintenance(self):
+    run_async(maintain_analytics_partitions())
+
+
+async def refresh_analytics_rollup():
+    async with async_session() as db:
+        await refresh_execution_rollup(db)
+        # Yesterday is redone too, for executions that finished after midnight
+        await refresh_daily_snapshots(db, datetime.now(timezone.utc) - timedelta(days=1))
+        # Drop spend that has aged out of each budget's rolling window
+        await refresh_budget_spend(db)
+        await db.commit()
+
+
+@celery_app.task(base=Singleton, bind=True)
+def singleton_analytics_rollup_refresh(self):
+    run_async(refresh_analytics_rollup())
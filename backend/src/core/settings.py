@@ -27,6 +27,9 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(default="postgres")
     POSTGRES_PORT: str = Field(default="5432")
     SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None
+    # Connections kept open per process, and extra ones allowed under load
+    POSTGRES_POOL_SIZE: int = Field(default=10)
+    POSTGRES_MAX_OVERFLOW: int = Field(default=10)
 
     ROUTER_WS_URL: str = Field(default="ws://genai-router:8080/ws")
     MASTER_BE_API_KEY: str = Field(
@@ -41,9 +44,17 @@ class Settings(BaseSettings):
 
     REDIS_BROKER_URI: str = Field(default="redis://genai-redis:6379/0")
     REDIS_BACKEND_URI: str = Field(default="redis://genai-redis:6379/0")
+    REDIS_CACHE_URI: str = Field(default="redis://genai-redis:6379/0")
 
     CELERY_BEAT_INTERVAL_MINUTES: int = Field(default=1)
 
+    # Analytics partitions older than this are dropped; 0 keeps everything
+    ANALYTICS_RETENTION_DAYS: int = Field(default=0)
+    # How often the hourly execution rollup is recomputed
+    ANALYTICS_ROLLUP_REFRESH_MINUTES: int = Field(default=5)
+    # How long dashboard responses are served from Redis; 0 disables caching
+    ANALYTICS_CACHE_TTL_SECONDS: int = Field(default=60)
+
     @model_validator(mode="after")
     def build_database_uri(self) -> Self:
         if not self.SQLALCHEMY_ASYNC_DATABASE_URI:
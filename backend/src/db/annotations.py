@@ -1,32 +1,83 @@
+import os
+import time
 import uuid
 from datetime import datetime
-from typing import Annotated, Any, Dict, List
+from typing import Annotated, Any, Dict, List, Optional
 
-from sqlalchemy import func
+from sqlalchemy import DateTime, func
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import mapped_column
 
+
+def uuid7(unix_ts_ms: Optional[int] = None) -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7).
+
+    48-bit millisecond timestamp followed by random bits, so new keys land
+    at the right edge of the primary key B-tree instead of a random page.
+    """
+    if unix_ts_ms is None:
+        unix_ts_ms = time.time_ns() // 1_000_000
+    value = (unix_ts_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 9562 variant
+    return uuid.UUID(int=value)
+
+
+# No index=True on the primary keys: the primary key constraint already
+# has its own index, and an extra ix_<table>_id would only duplicate it
+#
+# UUID columns keep as_uuid=True. asyncpg already decodes them into its own
+# uuid.UUID subclass, which holds the 16 raw bytes and only formats text on
+# str(), and SQLAlchemy hands that object through untouched. as_uuid=False
+# would add a str() conversion per value on every row read.
 int_pk = Annotated[
     int,
-    mapped_column(primary_key=True, index=True, autoincrement=True),
+    mapped_column(primary_key=True, autoincrement=True),
 ]
 uuid_pk = Annotated[
     str,
     mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
-        default=uuid.uuid4,
-        index=True,
+        default=uuid7,
+    ),
+]
+# Same as uuid_pk, but rows written outside the ORM (COPY, raw
+# INSERT) get their id from Postgres instead of having to ship one
+server_uuid_pk = Annotated[
+    str,
+    mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid7,
+        server_default=func.uuid_generate_v7(),
     ),
 ]
+# Timestamps come from the database clock on insert and update, so the
+# client neither computes nor ships them
 created_at = Annotated[datetime, mapped_column(server_default=func.now())]
 updated_at = Annotated[
-    datetime, mapped_column(server_default=func.now(), onupdate=datetime.now)
+    datetime, mapped_column(server_default=func.now(), onupdate=func.now())
+]
+# TIMESTAMPTZ variants: same 8 bytes, stored as UTC instead of a wall-clock
+# value whose zone depends on the writer
+created_at_tz = Annotated[
+    datetime, mapped_column(DateTime(timezone=True), server_default=func.now())
+]
+updated_at_tz = Annotated[
+    datetime,
+    mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    ),
 ]
 last_invoked_at = Annotated[
-    datetime, mapped_column(server_default=func.now(), onupdate=datetime.now)
+    datetime, mapped_column(server_default=func.now(), onupdate=func.now())
 ]
 
+# Plain JSON, not JSONB: these documents are only ever written and read back
+# whole, never filtered on, and json is stored and returned as text without
+# the parse/re-serialize round trip jsonb needs. Switch to JSONB together
+# with a GIN (jsonb_path_ops) index once a query filters inside them.
 not_null_json_column = Annotated[Dict[str, Any], mapped_column(JSON)]
 not_null_json_array_column = Annotated[List[Dict[str, str]], mapped_column(JSON)]
 
@@ -8,6 +8,11 @@ from typing import Any
 class Base:
     type_annotations_map = {dict[str, Any]: JSON}
 
+    # Read server-generated values (now() on updated_at) back with RETURNING
+    # on UPDATE as well as INSERT, instead of expiring them until the next
+    # load, which would need an implicit query under asyncio
+    __mapper_args__ = {"eager_defaults": True}
+
     # Generate __tablename__ automatically
     @declared_attr
     def __tablename__(cls) -> str:
@@ -0,0 +1,138 @@
+import re
+from datetime import date, datetime, time, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# The analytics tables are range partitioned by month on their time column.
+# Partitions are named <table>_pYYYYMM; rows outside every month land in
+# <table>_default.
+PARTITIONED_TABLE = "agentexecutions"
+PARTITIONED_TABLES = {
+    PARTITIONED_TABLE: "started_at",
+    "tokenusages": "created_at",
+    "executiontraces": "timestamp",
+}
+PARTITION_NAME_RE = re.compile(rf"^({'|'.join(PARTITIONED_TABLES)})_(p\d{{6}}|default)$")
+
+# Tables whose execution_id points at agentexecutions.id. There is no
+# database foreign key, so dropping a partition has to clean these up.
+EXECUTION_CHILD_TABLES = ("tokenusages", "executiontraces")
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def partition_name(month: date, table: str = PARTITIONED_TABLE) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def create_partition_ddl(month: date, table: str = PARTITIONED_TABLE) -> str:
+    """DDL for the partition of `table` covering the calendar month of `month`."""
+    start = month_start(month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(start, table)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start} 00:00+00') TO ('{next_month(start)} 00:00+00')"
+    )
+
+
+def create_default_partition_ddl(table: str = PARTITIONED_TABLE) -> str:
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def create_partitions_ddl(start: date, end: date, table: str = PARTITIONED_TABLE) -> list[str]:
+    """DDL for every monthly partition of `table` between `start` and `end`, inclusive."""
+    statements = []
+    month = month_start(start)
+    while month <= end:
+        statements.append(create_partition_ddl(month, table))
+        month = next_month(month)
+    return statements
+
+
+async def _create_partition(session: AsyncSession, table: str, month: date) -> None:
+    """Create the partition of `table` for `month` unless it already exists.
+
+    Postgres refuses to add a partition for a range that rows in the default
+    partition already fall into, so those rows are moved across while the
+    default partition is detached.
+    """
+    if await session.scalar(text("SELECT to_regclass(:name)"), {"name": partition_name(month, table)}):
+        return
+
+    default = f"{table}_default"
+    column = PARTITIONED_TABLES[table]
+    in_month = f"\"{column}\" >= '{month} 00:00+00' AND \"{column}\" < '{next_month(month)} 00:00+00'"
+    stranded = await session.scalar(text("SELECT to_regclass(:name)"), {"name": default}) and (
+        await session.scalar(text(f"SELECT EXISTS (SELECT FROM {default} WHERE {in_month})"))
+    )
+    if not stranded:
+        await session.execute(text(create_partition_ddl(month, table)))
+        return
+
+    await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await session.execute(text(create_partition_ddl(month, table)))
+    await session.execute(text(f"INSERT INTO {table} SELECT * FROM {default} WHERE {in_month}"))
+    await session.execute(text(f"DELETE FROM {default} WHERE {in_month}"))
+    await session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+
+
+async def ensure_partitions(session: AsyncSession, start: date, end: date) -> None:
+    """Create any missing monthly partitions between `start` and `end`."""
+    for table in PARTITIONED_TABLES:
+        month = month_start(start)
+        while month <= end:
+            await _create_partition(session, table, month)
+            month = next_month(month)
+
+
+async def _expired_partitions(session: AsyncSession, table: str, cutoff: datetime) -> list[str]:
+    """Monthly partitions of `table` that end on or before the UTC `cutoff`."""
+    result = await session.execute(
+        text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+        """),
+        {"table": table},
+    )
+    expired = []
+    for name in sorted(result.scalars()):
+        match = PARTITION_NAME_RE.match(name)
+        if not match or match.group(2) == "default":
+            continue
+        month = datetime.strptime(match.group(2), "p%Y%m").date()
+        if datetime.combine(next_month(month), time(), tzinfo=timezone.utc) <= cutoff:
+            expired.append(name)
+    return expired
+
+
+async def drop_partitions_before(session: AsyncSession, cutoff: datetime) -> list[str]:
+    """Drop monthly partitions that end on or before the UTC `cutoff`.
+
+    Token usage and trace partitions go first. Child rows that landed in a
+    later month than their execution are then deleted before the execution
+    partitions themselves are dropped. Returns the names of the dropped
+    partitions.
+    """
+    dropped = []
+    for child in EXECUTION_CHILD_TABLES:
+        for name in await _expired_partitions(session, child, cutoff):
+            await session.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+
+    for name in await _expired_partitions(session, PARTITIONED_TABLE, cutoff):
+        for child in EXECUTION_CHILD_TABLES:
+            await session.execute(
+                text(f"DELETE FROM {child} WHERE execution_id IN (SELECT id FROM {name})")
+            )
+        await session.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
@@ -0,0 +1,244 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Integer,
+    Select,
+    String,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.types import MicroUSD
+from src.models import AgentExecution, AnalyticsSnapshot
+from src.utils.enums import ExecutionStatus, SnapshotPeriodType
+
+# Hourly per user/agent/model aggregates of agentexecutions, kept as a
+# materialized view so dashboards read buckets instead of raw executions.
+# The view is created by migration 2c7f9a4e6b05.
+EXECUTION_ROLLUP_VIEW = "agentexecutions_hourly"
+
+execution_rollup = table(
+    EXECUTION_ROLLUP_VIEW,
+    column("user_id", UUID(as_uuid=True)),
+    column("agent_id", UUID(as_uuid=True)),
+    column("agent_name", String),
+    column("agent_type", AgentExecution.agent_type.type),
+    column("model_name", String),
+    column("bucket", DateTime(timezone=True)),
+    column("executions", BigInteger),
+    column("successful", BigInteger),
+    column("failed", BigInteger),
+    column("timed_out", BigInteger),
+    column("execution_time_ms", BigInteger),
+    column("input_tokens", BigInteger),
+    column("output_tokens", BigInteger),
+    column("total_tokens", BigInteger),
+    column("cost_micro_usd", MicroUSD),
+)
+
+# Executions are written when they start and updated when they finish, so a
+# bucket is only trusted once it is this much older than the newest bucket
+# in the view; anything more recent is read from agentexecutions.
+ROLLUP_SETTLE_TIME = timedelta(hours=1)
+
+
+async def refresh_execution_rollup(session: AsyncSession, concurrently: bool = True) -> None:
+    """Recompute the hourly execution rollup.
+
+    A concurrent refresh keeps the view readable while it runs; a plain one
+    is cheaper and fine when nothing else is reading, e.g. right after seeding.
+    """
+    mode = " CONCURRENTLY" if concurrently else ""
+    await session.execute(text(f"REFRESH MATERIALIZED VIEW{mode} {EXECUTION_ROLLUP_VIEW}"))
+
+
+async def execution_rollup_cutoff(
+    session: AsyncSession, user_id: Optional[uuid.UUID] = None
+) -> Optional[datetime]:
+    """End of the hours the rollup can answer for, or None if it has nothing.
+
+    Only reads the newest bucket, which the view's unique index on
+    (user_id, bucket, ...) answers directly.
+    """
+    query = select(func.max(execution_rollup.c.bucket))
+    if user_id:
+        query = query.where(execution_rollup.c.user_id == user_id)
+    latest = (await session.execute(query)).scalar()
+    return latest - ROLLUP_SETTLE_TIME if latest else None
+
+
+def _floor_hour(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def execution_buckets(
+    start: datetime,
+    end: datetime,
+    cutoff: Optional[datetime],
+    user_id: Optional[uuid.UUID] = None,
+    include_end: bool = True,
+) -> list[Select]:
+    """SELECTs whose UNION ALL covers the executions started in [start, end].
+
+    Every row has the rollup's columns. Whole UTC hours before `cutoff` come
+    from the rollup; the partial hours at either edge and everything after
+    the cutoff come from agentexecutions, one row per execution with a count
+    of 1. `include_end=False` makes the range half-open.
+    """
+    ae = AgentExecution
+    rollup = execution_rollup.c
+
+    def raw(lower: datetime, upper: datetime, upper_inclusive: bool) -> Select:
+        query = select(
+            ae.user_id,
+            ae.agent_id,
+            ae.agent_name,
+            ae.agent_type,
+            ae.model_name,
+            ae.started_at.label("bucket"),
+            literal(1, BigInteger).label("executions"),
+            case((ae.status == ExecutionStatus.success, 1), else_=0).label("successful"),
+            case((ae.status == ExecutionStatus.failure, 1), else_=0).label("failed"),
+            case((ae.status == ExecutionStatus.timeout, 1), else_=0).label("timed_out"),
+            ae.execution_time_ms,
+            ae.input_tokens,
+            ae.output_tokens,
+            ae.total_tokens,
+            ae.cost_usd.label("cost_micro_usd"),
+        ).where(
+            ae.started_at >= lower,
+            ae.started_at <= upper if upper_inclusive else ae.started_at < upper,
+        )
+        return query.where(ae.user_id == user_id) if user_id else query
+
+    first_hour = _floor_hour(start)
+    if first_hour < start:
+        first_hour += timedelta(hours=1)
+    last_hour = _floor_hour(end)
+    if cutoff is not None:
+        last_hour = min(last_hour, cutoff)
+    if cutoff is None or last_hour <= first_hour:
+        return [raw(start, end, include_end)]
+
+    hourly = select(*execution_rollup.c).where(
+        rollup.bucket >= first_hour,
+        rollup.bucket < last_hour,
+    )
+    if user_id:
+        hourly = hourly.where(rollup.user_id == user_id)
+    return [
+        hourly,
+        raw(start, first_hour, False),
+        raw(last_hour, end, include_end),
+    ]
+
+
+async def refresh_budget_spend(
+    session: AsyncSession, alert_id: Optional[uuid.UUID] = None
+) -> None:
+    """Recompute current spend of active budget alerts over their rolling window.
+
+    Between refreshes the agentexecutions trigger adds new costs as they are
+    written, but nothing subtracts spend that ages out of the window, so this
+    runs periodically and whenever an alert is created or changed.
+    """
+    alert_filter = " AND b.id = :alert_id" if alert_id else ""
+    await session.execute(
+        text(f"""
+            UPDATE budgetalerts AS b
+            SET current_spend_micro_usd = COALESCE((
+                SELECT sum(e.cost_micro_usd)
+                FROM agentexecutions e
+                WHERE e.user_id = b.user_id
+                  AND e.started_at >= now() - make_interval(days => b.period_days)
+                  AND (b.scope <> 'agent' OR b.scope_id IS NULL OR e.agent_id = b.scope_id)
+            ), 0)
+            WHERE b.is_active{alert_filter}
+        """),
+        {"alert_id": alert_id} if alert_id else {},
+    )
+
+
+async def refresh_daily_snapshots(session: AsyncSession, since: datetime) -> None:
+    """Upsert daily per user/agent/model snapshots for every UTC day from `since` on.
+
+    The aggregation and the write are a single INSERT ... SELECT ... ON
+    CONFLICT statement, so re-running it for a day overwrites that day's
+    rows in place instead of adding duplicates.
+    """
+    # Whole days only, so a partial day never overwrites a complete one
+    since = since.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    ae = AgentExecution
+    # Inline literals: bound parameters would make the SELECT and GROUP BY
+    # expressions differ as far as Postgres can tell
+    day = func.date_trunc(literal_column("'day'"), ae.started_at, literal_column("'UTC'"))
+
+    def percentile(fraction: float):
+        return cast(func.percentile_cont(fraction).within_group(ae.execution_time_ms), Integer)
+
+    buckets = (
+        select(
+            ae.user_id,
+            literal(SnapshotPeriodType.daily, AnalyticsSnapshot.period_type.type),
+            day,
+            ae.agent_id,
+            ae.model_name,
+            func.max(ae.agent_name),
+            func.count(),
+            func.count().filter(ae.status == ExecutionStatus.success),
+            func.count().filter(ae.status == ExecutionStatus.failure),
+            func.count().filter(ae.status == ExecutionStatus.timeout),
+            cast(func.avg(ae.execution_time_ms), Integer),
+            percentile(0.5),
+            percentile(0.95),
+            percentile(0.99),
+            func.sum(ae.input_tokens),
+            func.sum(ae.output_tokens),
+            func.sum(ae.total_tokens),
+            func.sum(ae.cost_usd),
+        )
+        .where(ae.started_at >= since)
+        .group_by(ae.user_id, day, ae.agent_id, ae.model_name)
+    )
+    snapshot = AnalyticsSnapshot.__table__
+    metrics = [
+        "agent_name",
+        "total_executions",
+        "successful_executions",
+        "failed_executions",
+        "timeout_executions",
+        "avg_execution_time_ms",
+        "p50_execution_time_ms",
+        "p95_execution_time_ms",
+        "p99_execution_time_ms",
+        "total_input_tokens",
+        "total_output_tokens",
+        "total_tokens",
+        "total_cost_micro_usd",
+    ]
+    stmt = insert(snapshot).from_select(
+        ["user_id", "period_type", "snapshot_date", "agent_id", "model_name", *metrics],
+        buckets,
+        # The ORM-side uuid7 default would be one value for every row
+        include_defaults=False,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_analyticssnapshots_bucket",
+        set_={name: stmt.excluded[name] for name in metrics},
+    )
+    await session.execute(stmt)
@@ -1,15 +1,23 @@
-from typing import Annotated, AsyncGenerator
+import asyncio
+from typing import Annotated, Any, AsyncGenerator, Awaitable, Callable, Sequence
 
 from fastapi import Depends
+from sqlalchemy import Executable, Row
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.core.settings import get_settings
 
 settings = get_settings()
 
+# Pooled connections are reused across requests, so each one keeps its
+# asyncpg prepared statements instead of reconnecting and re-parsing every
+# query. Code that runs each job on its own event loop (the Celery tasks)
+# must dispose the engine before the loop closes.
 engine = create_async_engine(
     settings.SQLALCHEMY_ASYNC_DATABASE_URI,
-    poolclass=NullPool,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
     future=True,
     # echo=settings.DEBUG,
     pool_pre_ping=True,
@@ -23,3 +31,45 @@ async def get_db() -> AsyncGenerator:
 
 
 AsyncDBSession = Annotated[AsyncSession, Depends(get_db)]
+
+
+async def fetch_concurrently(db: AsyncSession, *queries: Executable) -> list[Sequence[Row]]:
+    """Run independent read-only queries at once and return each one's rows.
+
+    A session can only run one statement at a time, so every query gets a
+    short-lived session of its own on `db`'s engine and holds a pooled
+    connection just for its duration. The queries do not share `db`'s
+    transaction or snapshot.
+
+    `db` is closed first, so its own connection goes back to the pool
+    instead of being held while the queries wait for theirs. Under enough
+    concurrent requests, every connection could otherwise end up held by a
+    request waiting for more. Closing ends `db`'s transaction, so callers
+    must not have pending writes; objects it loaded stay readable, detached.
+    """
+    await db.close()
+
+    async def fetch(query: Executable) -> Sequence[Row]:
+        async with AsyncSession(db.bind) as session:
+            result = await session.execute(query)
+            return result.all()
+
+    return await asyncio.gather(*(fetch(query) for query in queries))
+
+
+async def run_concurrently(
+    db: AsyncSession, *calls: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[Any]:
+    """Run independent read-only calls at once and return each one's result.
+
+    Like `fetch_concurrently`, for calls that run several statements, e.g.
+    repository methods: each is passed a short-lived session of its own on
+    `db`'s engine, and `db` is closed first to give back its connection.
+    """
+    await db.close()
+
+    async def run(call: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with AsyncSession(db.bind) as session:
+            return await call(session)
+
+    return await asyncio.gather(*(run(call) for call in calls))
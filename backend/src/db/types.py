@@ -0,0 +1,31 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+MICRO_USD_PER_USD = 1_000_000
+
+
+class MicroUSD(TypeDecorator):
+    """USD amount stored as a BIGINT count of micro-dollars (1e-6 USD).
+
+    Python code binds and reads ``Decimal`` dollars; the database only sees
+    integers, so ``SUM()`` runs on integer arithmetic instead of NUMERIC.
+    Aggregates over the column keep this type and are converted back once.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        micro = Decimal(str(value)) * MICRO_USD_PER_USD
+        return int(micro.to_integral_value(rounding=ROUND_HALF_UP))
+
+    def process_result_value(self, value: Any, dialect) -> Optional[Decimal]:
+        if value is None:
+            return None
+        # SUM(bigint) comes back as NUMERIC; scaleb keeps it exact either way
+        return Decimal(value).scaleb(-6)
@@ -2,82 +2,98 @@ import uuid
 from datetime import datetime
 from typing import List
 
-from sqlalchemy import ForeignKey, Numeric, UniqueConstraint
+from sqlalchemy import (
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    SmallInteger,
+    UniqueConstraint,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
 from src.db.annotations import (
     created_at,
+    created_at_tz,
     int_pk,
     last_invoked_at,
     not_null_json_array_column,
     not_null_json_column,
     nullable_json_column,
+    server_uuid_pk,
     updated_at,
+    updated_at_tz,
+    uuid7,
     uuid_pk,
 )
 from decimal import Decimal
 
 from src.db.base import Base
+from src.db.types import MicroUSD
 from src.utils.enums import (
+    AgentType,
     BudgetAlertType,
     BudgetScope,
     ExecutionStatus,
     ExecutionTraceStepType,
+    LogLevel,
     SenderType,
+    SnapshotPeriodType,
 )
 
 
 class UserProjectAssociation(Base):
     __tablename__ = "user_project_associations"
-    id: Mapped[int] = mapped_column(autoincrement=True, index=True, primary_key=True)
 
+    # The composite primary key doubles as the index for lookups by its
+    # first column; the second one gets its own
     user_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
 
     project_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
 class UserTeamAssociation(Base):
     __tablename__ = "user_team_associations"
-    id: Mapped[int] = mapped_column(autoincrement=True, index=True, primary_key=True)
 
     user_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
 
     team_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
 class AgentProjectAssociation(Base):
     __tablename__ = "agent_project_associations"
-    id: Mapped[int] = mapped_column(autoincrement=True, index=True, primary_key=True)
 
     agent_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("agents.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("agents.id", ondelete="CASCADE"), primary_key=True
     )
 
     project_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
 class AgentFlowProjectAssociation(Base):
     __tablename__ = "agentflow_project_associations"
-    id: Mapped[int] = mapped_column(autoincrement=True, index=True, primary_key=True)
 
     flow_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("agentworkflows.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("agentworkflows.id", ondelete="CASCADE"), primary_key=True
     )
 
     project_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
 
@@ -154,6 +170,16 @@ class Agent(Base):
         secondary="agent_project_associations", back_populates="agents"
     )
 
+    # Active agents are listed per creator, newest first
+    __table_args__ = (
+        Index(
+            "ix_agents_creator_active",
+            "creator_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
+    )
+
 
 class AgentWorkflow(Base):
     id: Mapped[uuid_pk]
@@ -177,6 +203,15 @@ class AgentWorkflow(Base):
         secondary="agentflow_project_associations", back_populates="flows"
     )
 
+    # Active flows are looked up per creator
+    __table_args__ = (
+        Index(
+            "ix_agentworkflows_creator_active",
+            "creator_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
 
 class Project(Base):
     id: Mapped[uuid_pk]
@@ -209,45 +244,59 @@ class Log(Base):
     id: Mapped[int_pk]
 
     session_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=False
+        UUID(as_uuid=True), nullable=False
     )
     request_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=False
+        UUID(as_uuid=True), nullable=False
     )
     agent_id: Mapped[str] = mapped_column(index=True, nullable=True)
     creator_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
     )
-    creator: Mapped["User"] = relationship(back_populates="logs")
+    creator: Mapped["User"] = relationship(back_populates="logs", lazy="raise")
 
     created_at: Mapped[created_at]
     updated_at: Mapped[updated_at]
 
     message: Mapped[str] = mapped_column(nullable=False)
-    log_level: Mapped[str] = mapped_column(nullable=False)  # TODO: enum
+    log_level: Mapped[LogLevel] = mapped_column(nullable=False)
+
+    # Looked up by equality only, see File
+    __table_args__ = (
+        Index("ix_logs_session_id", "session_id", postgresql_using="hash"),
+        Index("ix_logs_request_id", "request_id", postgresql_using="hash"),
+    )
 
 
 class File(Base):
     id: Mapped[uuid_pk]
 
     session_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=True
+        UUID(as_uuid=True), nullable=True
     )
     request_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=True
+        UUID(as_uuid=True), nullable=True
     )
     creator_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
     )
-    creator: Mapped["User"] = relationship(back_populates="files")
+    creator: Mapped["User"] = relationship(back_populates="files", lazy="raise")
     mimetype: Mapped[str]
     original_name: Mapped[str]
     internal_name: Mapped[str]
     internal_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=False
+        UUID(as_uuid=True), nullable=False
     )
     from_agent: Mapped[bool]
 
+    # Random UUIDs only ever compared with =: hash indexes are smaller than
+    # btrees and do not fragment on random keys
+    __table_args__ = (
+        Index("ix_files_session_id", "session_id", postgresql_using="hash"),
+        Index("ix_files_request_id", "request_id", postgresql_using="hash"),
+        Index("ix_files_internal_id", "internal_id", postgresql_using="hash"),
+    )
+
 
 class ModelProvider(Base):
     id: Mapped[uuid_pk]
@@ -257,10 +306,12 @@ class ModelProvider(Base):
     provider_metadata: Mapped[not_null_json_column]
     configs: Mapped[List["ModelConfig"]] = relationship(  # noqa: F821
         back_populates="provider",
+        lazy="selectin",
     )
 
+    # Indexed through the leading column of the unique constraint below
     creator_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
     creator: Mapped["User"] = relationship(back_populates="model_providers")
     created_at: Mapped[created_at]
@@ -281,7 +332,7 @@ class ModelConfig(Base):
 
     system_prompt: Mapped[str]
     user_prompt: Mapped[str] = mapped_column(nullable=True)
-    max_last_messages: Mapped[int] = mapped_column(default=5, nullable=False)
+    max_last_messages: Mapped[int] = mapped_column(SmallInteger, default=5, nullable=False)
     temperature: Mapped[float] = mapped_column(default=0.7)
 
     credentials: Mapped[not_null_json_column]
@@ -310,14 +361,22 @@ class MCPServer(Base):
 
     creator: Mapped["User"] = relationship(back_populates="mcpservers")  # noqa: F821
 
+    # Indexed through the leading column of the unique constraint below
     creator_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
 
     is_active: Mapped[bool]
 
     __table_args__ = (
         UniqueConstraint("creator_id", "server_url", name="uq_mcp_server_url"),
+        # Active servers are listed per creator, newest first
+        Index(
+            "ix_mcpservers_creator_active",
+            "creator_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -333,7 +392,9 @@ class MCPTool(Base):
 
     alias: Mapped[str] = mapped_column(nullable=True)
 
-    mcp_server: Mapped["MCPServer"] = relationship(back_populates="mcp_tools")  # noqa: F821
+    mcp_server: Mapped["MCPServer"] = relationship(  # noqa: F821
+        back_populates="mcp_tools", lazy="raise"
+    )
 
     mcp_server_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("mcpservers.id", ondelete="CASCADE"), nullable=True, index=True
@@ -360,11 +421,19 @@ class A2ACard(Base):
 
     creator: Mapped["User"] = relationship(back_populates="a2acards")  # noqa: F821
 
+    # Indexed through the leading column of the unique constraint below
     creator_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
     __table_args__ = (
         UniqueConstraint("creator_id", "server_url", name="uq_a2a_card_server_url"),
+        # Active cards are listed per creator, newest first
+        Index(
+            "ix_a2acards_creator_active",
+            "creator_id",
+            text("created_at DESC"),
+            postgresql_where=text("is_active"),
+        ),
     )
 
 
@@ -382,18 +451,25 @@ class ChatMessage(Base):
     created_at: Mapped[created_at]
     updated_at: Mapped[updated_at]
 
+    # Indexed together with created_at below
     conversation_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("chatconversations.session_id", ondelete="CASCADE"),
         nullable=True,
-        index=True,
     )
-    conversation: Mapped["ChatConversation"] = relationship(back_populates="messages")
+    conversation: Mapped["ChatConversation"] = relationship(
+        back_populates="messages", lazy="raise"
+    )
+
+    __table_args__ = (
+        # History is always read per conversation in created_at order
+        Index("ix_chatmessages_conversation_created", "conversation_id", "created_at"),
+    )
 
 
 class ChatConversation(Base):
     """Chat history"""
 
-    session_id: Mapped[uuid_pk] = mapped_column(nullable=False, index=True)
+    session_id: Mapped[uuid_pk] = mapped_column(nullable=False)
     title: Mapped[str]
 
     created_at: Mapped[created_at]
@@ -410,9 +486,7 @@ class ChatConversation(Base):
 
 
 class UserProfile(Base):
-    id: Mapped[uuid.UUID] = mapped_column(
-        primary_key=True, default=uuid.uuid4, index=True
-    )
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
 
     first_name: Mapped[str] = mapped_column(nullable=True)
     last_name: Mapped[str] = mapped_column(nullable=True)
@@ -438,22 +512,24 @@ class AgentExecution(Base):
 
     id: Mapped[uuid_pk]
     request_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=False
+        UUID(as_uuid=True), nullable=False
     )
     session_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=False
+        UUID(as_uuid=True), nullable=False
     )
 
     # The agent that was executed (can be genai agent, mcp tool, or a2a card)
+    # (indexed through ix_agentexecutions_agent_started below)
     agent_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), index=True, nullable=True
+        UUID(as_uuid=True), nullable=True
     )
-    agent_type: Mapped[str] = mapped_column(nullable=True)  # genai, mcp, a2a, flow
+    agent_type: Mapped[AgentType] = mapped_column(nullable=True)
     agent_name: Mapped[str] = mapped_column(nullable=True)
 
     # User who triggered the execution
+    # (indexed through ix_agentexecutions_user_started below)
     user_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
 
     # Model configuration used
@@ -462,9 +538,14 @@ class AgentExecution(Base):
     )
     model_name: Mapped[str] = mapped_column(nullable=True)
 
-    # Timing
-    started_at: Mapped[created_at]
-    completed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    # Timing. started_at is the partition key, and Postgres requires it in
+    # the primary key of a partitioned table
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Status
     status: Mapped[ExecutionStatus] = mapped_column(default=ExecutionStatus.pending)
@@ -480,29 +561,82 @@ class AgentExecution(Base):
     execution_time_ms: Mapped[int] = mapped_column(default=0)
     llm_time_ms: Mapped[int] = mapped_column(default=0, nullable=True)
 
-    # Cost (stored in USD)
+    # Cost in USD, stored as integer micro-dollars
     cost_usd: Mapped[Decimal] = mapped_column(
-        Numeric(precision=10, scale=6), default=Decimal("0.000000")
+        "cost_micro_usd", MicroUSD, default=Decimal("0")
     )
 
-    # Parent execution for nested agent calls
+    # Parent execution for nested agent calls. Not a database foreign key:
+    # agentexecutions.id alone is not unique across partitions
     parent_execution_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("agentexecutions.id", ondelete="SET NULL"), nullable=True, index=True
+        UUID(as_uuid=True), nullable=True
     )
 
     # Query/input summary (truncated for privacy)
     query_preview: Mapped[str] = mapped_column(nullable=True)
 
-    # Relationships
+    # Relationships. Children reference the execution id without a database
+    # foreign key, so the join is spelled out and deletes cascade in the ORM.
+    # List queries never need them; load them explicitly with an eager loader option
     traces: Mapped[List["ExecutionTrace"]] = relationship(
-        back_populates="execution", cascade="all, delete-orphan"
+        primaryjoin="AgentExecution.id == foreign(ExecutionTrace.execution_id)",
+        back_populates="execution",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
     token_usages: Mapped[List["TokenUsage"]] = relationship(
-        back_populates="execution", cascade="all, delete-orphan"
+        primaryjoin="AgentExecution.id == foreign(TokenUsage.execution_id)",
+        back_populates="execution",
+        cascade="all, delete-orphan",
+        lazy="raise",
     )
 
-    created_at: Mapped[created_at]
-    updated_at: Mapped[updated_at]
+    created_at: Mapped[created_at_tz]
+    updated_at: Mapped[updated_at_tz]
+
+    __table_args__ = (
+        # Dashboard queries filter by user and time range and aggregate these
+        # columns; id makes it match the executions list's keyset order
+        Index(
+            "ix_agentexecutions_user_started",
+            "user_id",
+            text("started_at DESC"),
+            text("id DESC"),
+            postgresql_include=[
+                "status",
+                "cost_micro_usd",
+                "total_tokens",
+                "execution_time_ms",
+                "agent_id",
+                "model_name",
+            ],
+        ),
+        Index(
+            "ix_agentexecutions_failures",
+            "user_id",
+            text("started_at DESC"),
+            postgresql_where=text("status IN ('failure', 'timeout')"),
+        ),
+        # Per-agent stats and agent-scoped budget checks
+        Index(
+            "ix_agentexecutions_agent_started",
+            "agent_id",
+            text("started_at DESC"),
+            postgresql_include=["user_id", "status", "cost_micro_usd"],
+        ),
+        # Equality-only lookups (get_by_request_id / get_by_session_id)
+        Index("ix_agentexecutions_request_id", "request_id", postgresql_using="hash"),
+        Index("ix_agentexecutions_session_id", "session_id", postgresql_using="hash"),
+        # Rows arrive in started_at order, so a BRIN range index suffices
+        Index(
+            "ix_agentexecutions_started_brin",
+            "started_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Monthly range partitions, see src.db.partitions
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
 
     def __repr__(self) -> str:
         return f"<AgentExecution(id={self.id}, agent={self.agent_name}, status={self.status})>"
@@ -513,15 +647,21 @@ class TokenUsage(Base):
 
     __tablename__ = "tokenusages"
 
-    id: Mapped[uuid_pk]
+    id: Mapped[server_uuid_pk]
+    # References agentexecutions.id; see AgentExecution.token_usages
+    # (indexed together with step_number below)
     execution_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("agentexecutions.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), nullable=False
+    )
+    execution: Mapped["AgentExecution"] = relationship(
+        primaryjoin="AgentExecution.id == foreign(TokenUsage.execution_id)",
+        back_populates="token_usages",
+        lazy="raise",
     )
-    execution: Mapped["AgentExecution"] = relationship(back_populates="token_usages")
 
     # Which component used the tokens
     component: Mapped[str] = mapped_column(nullable=False)  # master_agent, agent_{name}, mcp_tool, etc.
-    step_number: Mapped[int] = mapped_column(nullable=True)
+    step_number: Mapped[int] = mapped_column(SmallInteger, nullable=True)
 
     # Token counts
     input_tokens: Mapped[int] = mapped_column(default=0)
@@ -530,12 +670,28 @@ class TokenUsage(Base):
     # Model used
     model: Mapped[str] = mapped_column(nullable=True)
 
-    # Cost
+    # Cost in USD, stored as integer micro-dollars
     cost_usd: Mapped[Decimal] = mapped_column(
-        Numeric(precision=10, scale=6), default=Decimal("0.000000")
+        "cost_micro_usd", MicroUSD, default=Decimal("0")
     )
 
-    created_at: Mapped[created_at]
+    # Partition key, so part of the primary key as well
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
+    __table_args__ = (
+        # Usages are always read per execution in step order
+        Index("ix_tokenusages_execution_step", "execution_id", "step_number"),
+        Index(
+            "ix_tokenusages_created_at_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Monthly range partitions, see src.db.partitions
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
 
 class ExecutionTrace(Base):
@@ -543,13 +699,19 @@ class ExecutionTrace(Base):
 
     __tablename__ = "executiontraces"
 
-    id: Mapped[uuid_pk]
+    id: Mapped[server_uuid_pk]
+    # References agentexecutions.id; see AgentExecution.traces
+    # (indexed together with step_number below)
     execution_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("agentexecutions.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), nullable=False
+    )
+    execution: Mapped["AgentExecution"] = relationship(
+        primaryjoin="AgentExecution.id == foreign(ExecutionTrace.execution_id)",
+        back_populates="traces",
+        lazy="raise",
     )
-    execution: Mapped["AgentExecution"] = relationship(back_populates="traces")
 
-    step_number: Mapped[int] = mapped_column(nullable=False)
+    step_number: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     step_type: Mapped[ExecutionTraceStepType]
 
     # Content of the step (thought, action, observation, etc.)
@@ -561,14 +723,29 @@ class ExecutionTrace(Base):
     )
     invoked_agent_name: Mapped[str] = mapped_column(nullable=True)
 
-    # Timing
-    timestamp: Mapped[created_at]
+    # Timing. timestamp is the partition key, so part of the primary key as well
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
     duration_ms: Mapped[int] = mapped_column(default=0)
 
     # Token usage for this step
     input_tokens: Mapped[int] = mapped_column(default=0, nullable=True)
     output_tokens: Mapped[int] = mapped_column(default=0, nullable=True)
 
+    __table_args__ = (
+        # Traces are always read per execution in step order
+        Index("ix_executiontraces_execution_step", "execution_id", "step_number"),
+        Index(
+            "ix_executiontraces_timestamp_brin",
+            "timestamp",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Monthly range partitions, see src.db.partitions
+        {"postgresql_partition_by": 'RANGE ("timestamp")'},
+    )
+
 
 class BudgetAlert(Base):
     """Budget alerts and spending limits."""
@@ -579,7 +756,7 @@ class BudgetAlert(Base):
 
     # Who owns this budget
     user_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
     # What the budget applies to
@@ -592,23 +769,45 @@ class BudgetAlert(Base):
     threshold_usd: Mapped[Decimal] = mapped_column(
         Numeric(precision=10, scale=2), nullable=False
     )
-    period_days: Mapped[int] = mapped_column(default=30)  # Rolling window
+    period_days: Mapped[int] = mapped_column(SmallInteger, default=30)  # Rolling window
 
     # Alert settings
     alert_type: Mapped[BudgetAlertType] = mapped_column(default=BudgetAlertType.warning)
-    alert_at_percentage: Mapped[int] = mapped_column(default=80)  # Alert at 80% of budget
+    alert_at_percentage: Mapped[int] = mapped_column(
+        SmallInteger, default=80
+    )  # Alert at 80% of budget
     webhook_url: Mapped[str] = mapped_column(nullable=True)
     email_notification: Mapped[bool] = mapped_column(default=True)
 
     # Status
     is_active: Mapped[bool] = mapped_column(default=True)
-    last_alert_sent_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    last_alert_sent_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Stored as integer micro-dollars, like the execution costs it sums.
+    # Kept up to date by the budgetalerts_add_execution_cost trigger on
+    # agentexecutions and resynced to the rolling window by
+    # src.db.rollups.refresh_budget_spend.
     current_spend_usd: Mapped[Decimal] = mapped_column(
-        Numeric(precision=10, scale=2), default=Decimal("0.00")
+        "current_spend_micro_usd", MicroUSD, default=Decimal("0")
     )
 
-    created_at: Mapped[created_at]
-    updated_at: Mapped[updated_at]
+    created_at: Mapped[created_at_tz]
+    updated_at: Mapped[updated_at_tz]
+
+    __table_args__ = (
+        CheckConstraint(
+            "alert_at_percentage BETWEEN 1 AND 100",
+            name="ck_budgetalerts_alert_at_percentage",
+        ),
+        CheckConstraint("period_days > 0", name="ck_budgetalerts_period_days"),
+        # Only active alerts are listed or touched by the spend trigger
+        Index(
+            "ix_budgetalerts_user_id_active",
+            "user_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
 
 
 class AnalyticsSnapshot(Base):
@@ -616,15 +815,18 @@ class AnalyticsSnapshot(Base):
 
     __tablename__ = "analyticssnapshots"
 
-    id: Mapped[uuid_pk]
+    # Written by INSERT ... SELECT, see src.db.rollups.refresh_daily_snapshots
+    id: Mapped[server_uuid_pk]
 
     # Snapshot period
-    snapshot_date: Mapped[datetime] = mapped_column(index=True, nullable=False)
-    period_type: Mapped[str] = mapped_column(nullable=False)  # hourly, daily, weekly, monthly
+    snapshot_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    period_type: Mapped[SnapshotPeriodType] = mapped_column(nullable=False)
 
-    # Scope
+    # Scope (user_id is indexed through uq_analyticssnapshots_bucket)
     user_id: Mapped[uuid.UUID] = mapped_column(
-        ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
     agent_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), nullable=True, index=True
@@ -649,10 +851,48 @@ class AnalyticsSnapshot(Base):
     total_output_tokens: Mapped[int] = mapped_column(default=0)
     total_tokens: Mapped[int] = mapped_column(default=0)
 
-    # Cost metrics
+    # Cost metrics, stored as integer micro-dollars
     total_cost_usd: Mapped[Decimal] = mapped_column(
-        Numeric(precision=10, scale=2), default=Decimal("0.00")
+        "total_cost_micro_usd", MicroUSD, default=Decimal("0")
     )
 
-    created_at: Mapped[created_at]
+    created_at: Mapped[created_at_tz]
+
+    __table_args__ = (
+        # One row per bucket, the conflict target of the snapshot upsert.
+        # Equality columns first, then the date range. The scope columns
+        # are nullable, so NULLs must compare equal.
+        UniqueConstraint(
+            "user_id",
+            "period_type",
+            "snapshot_date",
+            "agent_id",
+            "model_name",
+            name="uq_analyticssnapshots_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index(
+            "ix_analyticssnapshots_snapshot_date_brin",
+            "snapshot_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+    )
+
+
+class ModelPricing(Base):
+    """Per-model token prices, the single source for execution cost math."""
+
+    __tablename__ = "modelpricings"
+
+    model_name: Mapped[str] = mapped_column(primary_key=True)
+
+    # USD per 1K tokens
+    input_cost_per_1k: Mapped[Decimal] = mapped_column(
+        Numeric(precision=12, scale=8), nullable=False
+    )
+    output_cost_per_1k: Mapped[Decimal] = mapped_column(
+        Numeric(precision=12, scale=8), nullable=False
+    )
 
+    updated_at: Mapped[updated_at_tz]
@@ -1,16 +1,44 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional, Tuple
-
-from sqlalchemy import and_, case, desc, func, select
+from typing import Any, AsyncIterator, List, Optional, Tuple, Union
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    DateTime,
+    Float,
+    Numeric,
+    Row,
+    String,
+    Subquery,
+    Uuid,
+    and_,
+    cast,
+    column,
+    delete,
+    desc,
+    func,
+    lambda_stmt,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    values,
+)
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
+from src.db.rollups import execution_buckets, execution_rollup_cutoff, refresh_budget_spend
+from src.db.session import fetch_concurrently
+from src.db.types import MicroUSD
 from src.models import (
     AgentExecution,
     AnalyticsSnapshot,
     BudgetAlert,
     ExecutionTrace,
+    ModelPricing,
     TokenUsage,
 )
 from src.repositories.base import CRUDBase
@@ -31,57 +59,164 @@ from src.schemas.api.analytics.schemas import (
     BudgetAlertCreate,
     BudgetAlertUpdate,
     ExecutionTraceCreate,
+    ModelPricingCreate,
     TokenUsageCreate,
 )
-from src.utils.enums import ExecutionStatus
+from src.utils.enums import AgentType, BudgetScope, ExecutionStatus
+from src.utils.exceptions import InvalidCursor
+
+
+# Cursors are "<started_at in UTC>_<id>", safe to pass unescaped in a query string
+CURSOR_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _encode_cursor(row: Row) -> str:
+    return f"{row.started_at.astimezone(timezone.utc).strftime(CURSOR_TIME_FORMAT)}_{row.id}"
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    started_at, _, execution_id = cursor.partition("_")
+    try:
+        return (
+            datetime.strptime(started_at, CURSOR_TIME_FORMAT).replace(tzinfo=timezone.utc),
+            UUID(execution_id),
+        )
+    except ValueError as e:
+        raise InvalidCursor(str(e)) from e
+
+
+def _sum(column: ColumnElement, *criteria: ColumnElement) -> ColumnElement:
+    """SUM of a rollup column, optionally FILTERed, typed like the column.
+
+    SUM(bigint) is NUMERIC in Postgres; casting back keeps counts as ints and
+    lets MicroUSD convert summed costs to dollars.
+    """
+    total = func.sum(column)
+    if criteria:
+        total = total.filter(*criteria)
+    return cast(total, MicroUSD if isinstance(column.type, MicroUSD) else BigInteger)
+
+
+def _percent(part: ColumnElement, whole: ColumnElement) -> ColumnElement:
+    """`part` as a percentage of `whole`; NULL when `whole` is NULL or zero."""
+    return cast(part, Float) / func.nullif(cast(whole, Float), 0) * 100
+
+
+def _change(current: ColumnElement, previous: ColumnElement) -> ColumnElement:
+    """Percent change from `previous` to `current`; NULL when `previous` is NULL or zero.
+
+    A missing current value counts as zero, as the dashboard shows it.
+    """
+    return (
+        (cast(func.coalesce(current, 0), Float) - cast(previous, Float))
+        / func.nullif(cast(previous, Float), 0)
+        * 100
+    )
+
+
+def _share(group_total: ColumnElement) -> ColumnElement:
+    """A grouped row's percentage of `group_total` summed over all groups; 0 when that is 0."""
+    return func.coalesce(_percent(group_total, func.sum(group_total).over()), 0.0)
+
+
+def _avg_time(buckets: Subquery, *criteria: ColumnElement) -> ColumnElement:
+    """Mean execution time over rollup rows, weighted by their execution counts."""
+    return _sum(buckets.c.execution_time_ms, *criteria) / func.nullif(
+        _sum(buckets.c.executions, *criteria), 0
+    ).cast(Numeric)
+
+
+# Fixed-shape lookups below are built with lambda_stmt: the statement is
+# constructed and its cache key computed once per call site, and later calls
+# only pull the new parameter values out of the closure. The model is copied
+# into a local first because a lambda may only close over SQL elements and
+# plain values, not the repository itself.
 
 
 class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, AgentExecutionUpdate]):
     """Repository for agent execution analytics."""
 
     async def get_with_details(
-        self, db: AsyncSession, execution_id: str
+        self, db: AsyncSession, execution_id: UUID
     ) -> Optional[AgentExecution]:
-        """Get execution with traces and token usages."""
+        """Get execution with traces and token usages.
+
+        Token usages are a handful of narrow rows per execution, so they are
+        joined into the execution query. Traces carry step content and can be
+        numerous, so they keep their own SELECT instead of multiplying the
+        joined rows.
+        """
+        model = self.model
         result = await db.execute(
-            select(self.model)
-            .options(
-                selectinload(AgentExecution.traces),
-                selectinload(AgentExecution.token_usages),
+            lambda_stmt(
+                lambda: select(model)
+                .options(
+                    joinedload(model.token_usages),
+                    selectinload(model.traces),
+                    raiseload("*"),
+                )
+                .where(model.id == execution_id)
             )
-            .where(self.model.id == execution_id)
         )
-        return result.scalars().first()
+        return result.unique().scalars().first()
 
     async def get_by_request_id(
-        self, db: AsyncSession, request_id: str
+        self, db: AsyncSession, request_id: UUID
     ) -> List[AgentExecution]:
         """Get all executions for a request."""
+        model = self.model
         result = await db.execute(
-            select(self.model)
-            .where(self.model.request_id == request_id)
-            .order_by(self.model.started_at)
+            lambda_stmt(
+                lambda: select(model)
+                .where(model.request_id == request_id)
+                .order_by(model.started_at)
+            )
         )
         return result.scalars().all()
 
     async def get_by_session_id(
-        self, db: AsyncSession, session_id: str, limit: int = 100
+        self, db: AsyncSession, session_id: UUID, limit: int = 100
     ) -> List[AgentExecution]:
         """Get all executions for a session."""
+        model = self.model
         result = await db.execute(
-            select(self.model)
-            .where(self.model.session_id == session_id)
-            .order_by(desc(self.model.started_at))
-            .limit(limit)
+            lambda_stmt(
+                lambda: select(model)
+                .where(model.session_id == session_id)
+                .order_by(desc(model.started_at))
+                .limit(limit)
+            )
         )
         return result.scalars().all()
 
+    def _summary_columns(self) -> tuple:
+        """Columns behind `AgentExecutionSummaryDTO` and the export rows.
+
+        The ids are cast to text in SQL, so rows already hold the strings
+        the DTO and the export want.
+        """
+        return (
+            cast(self.model.id, String).label("id"),
+            cast(self.model.request_id, String).label("request_id"),
+            cast(self.model.session_id, String).label("session_id"),
+            self.model.agent_name,
+            self.model.agent_type,
+            self.model.model_name,
+            self.model.status,
+            self.model.execution_time_ms,
+            self.model.total_tokens,
+            self.model.cost_usd,
+            self.model.started_at,
+            self.model.completed_at,
+            self.model.query_preview,
+        )
+
     async def list_paginated(
         self,
         db: AsyncSession,
-        user_id: Optional[str] = None,
-        agent_id: Optional[str] = None,
-        agent_type: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        agent_id: Optional[UUID] = None,
+        agent_type: Optional[AgentType] = None,
         model_name: Optional[str] = None,
         status: Optional[ExecutionStatus] = None,
         start_date: Optional[datetime] = None,
@@ -90,8 +225,15 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
         page_size: int = 20,
         sort_by: str = "started_at",
         sort_order: str = "desc",
+        cursor: Optional[str] = None,
     ) -> PaginatedExecutionsDTO:
-        """Get paginated list of executions with filters."""
+        """Get paginated list of executions with filters.
+
+        Sorted by `started_at`, each full page returns a `next_cursor`. Passing
+        it back seeks straight past the rows already seen instead of skipping
+        `(page - 1) * page_size` rows with OFFSET. Raises InvalidCursor for a
+        malformed cursor or one combined with another sort column.
+        """
         # Build filters
         filters = []
         if user_id:
@@ -109,141 +251,229 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
         if end_date:
             filters.append(self.model.started_at <= end_date)
 
-        # Count total
-        count_query = select(func.count()).select_from(self.model)
-        if filters:
-            count_query = count_query.where(and_(*filters))
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-
-        # Get items
-        query = select(self.model)
+        sort_column = getattr(self.model, sort_by, self.model.started_at)
+        keyset = sort_column is self.model.started_at
+        if cursor and not keyset:
+            raise InvalidCursor("cursor pagination requires sort_by=started_at")
+
+        # Get items as plain rows of the summary columns; the list view never
+        # needs ORM instances, or error_message, which can be a large TOASTed value.
+        # Without a cursor the window count carries the total of all matching
+        # rows on each row
+        query = select(*self._summary_columns())
+        if not cursor:
+            query = query.add_columns(func.count().over().label("total_count"))
         if filters:
             query = query.where(and_(*filters))
 
-        # Sort
-        sort_column = getattr(self.model, sort_by, self.model.started_at)
+        # Sort. id breaks ties between executions started at the same instant
+        # so a cursor always points at a single row
+        order = [sort_column, self.model.id] if keyset else [sort_column]
         if sort_order == "desc":
-            query = query.order_by(desc(sort_column))
+            query = query.order_by(*map(desc, order))
         else:
-            query = query.order_by(sort_column)
+            query = query.order_by(*order)
 
         # Paginate
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
+        if cursor:
+            position = tuple_(self.model.started_at, self.model.id)
+            last_seen = tuple_(*_decode_cursor(cursor))
+            query = query.where(position < last_seen if sort_order == "desc" else position > last_seen)
+        else:
+            query = query.offset((page - 1) * page_size)
+        query = query.limit(page_size)
 
         result = await db.execute(query)
-        items = result.scalars().all()
+        items = result.all()
+
+        # A cursor page only sees the rows after the cursor, and counting
+        # every match would scan them all, so cursor pages leave the total
+        # out; the first page already reported it
+        total = None
+        if not cursor:
+            if items:
+                total = items[0].total_count
+            elif page > 1:
+                # Past the last page there is no row to carry the count
+                count_query = select(func.count()).select_from(self.model)
+                if filters:
+                    count_query = count_query.where(and_(*filters))
+                total_result = await db.execute(count_query)
+                total = total_result.scalar() or 0
+            else:
+                total = 0
 
+        # The summary columns already have the DTO's types, so the items are
+        # built without validation; total_count is not a field and is dropped
         return PaginatedExecutionsDTO(
-            items=[
-                AgentExecutionSummaryDTO(
-                    id=str(item.id),
-                    request_id=str(item.request_id),
-                    session_id=str(item.session_id),
-                    agent_name=item.agent_name,
-                    agent_type=item.agent_type,
-                    model_name=item.model_name,
-                    status=item.status,
-                    execution_time_ms=item.execution_time_ms,
-                    total_tokens=item.total_tokens,
-                    cost_usd=item.cost_usd,
-                    started_at=item.started_at,
-                    completed_at=item.completed_at,
-                    query_preview=item.query_preview,
-                )
-                for item in items
-            ],
+            items=[AgentExecutionSummaryDTO.model_construct(**item._mapping) for item in items],
             total=total,
             page=page,
             page_size=page_size,
-            total_pages=(total + page_size - 1) // page_size,
+            total_pages=(total + page_size - 1) // page_size if total is not None else None,
+            next_cursor=_encode_cursor(items[-1]) if keyset and len(items) == page_size else None,
         )
 
+    async def stream_export_rows(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        start_date: datetime,
+        end_date: datetime,
+        limit: Optional[int] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Row]:
+        """Yield a user's executions in the range as plain rows, newest first.
+
+        Rows come off a server-side cursor `batch_size` at a time and are
+        never turned into ORM instances, so memory stays bounded by the batch
+        however many rows there are.
+        """
+        query = (
+            select(*self._summary_columns())
+            .where(
+                self.model.user_id == user_id,
+                self.model.started_at >= start_date,
+                self.model.started_at <= end_date,
+            )
+            .order_by(desc(self.model.started_at))
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(query)
+        async for row in result:
+            yield row
+
     async def get_overview(
         self,
         db: AsyncSession,
-        user_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        concurrent: bool = True,
     ) -> AnalyticsOverviewDTO:
-        """Get analytics overview for dashboard."""
+        """Get analytics overview for dashboard.
+
+        Pass `concurrent=False` when the caller already runs this alongside
+        other work on a connection of its own, so the breakdown queries run
+        one after another on `db` instead of taking more connections.
+        """
         # Default to last 24 hours if no dates specified
         if not end_date:
-            end_date = datetime.utcnow()
+            end_date = datetime.now(timezone.utc)
         if not start_date:
             start_date = end_date - timedelta(hours=24)
 
-        # Build base filter
-        filters = [
-            self.model.started_at >= start_date,
-            self.model.started_at <= end_date,
-        ]
-        if user_id:
-            filters.append(self.model.user_id == user_id)
+        # The previous period of the same length directly precedes this one
+        period_length = end_date - start_date
+        prev_start = start_date - period_length
 
-        # Get aggregate metrics
+        # Aggregates read settled hours from the hourly rollup and only the
+        # partial hours at the edges of each period from raw executions
+        cutoff = await execution_rollup_cutoff(db, user_id)
+        current_buckets = execution_buckets(start_date, end_date, cutoff, user_id)
+        prev_buckets = execution_buckets(prev_start, start_date, cutoff, user_id, include_end=False)
+        periods = union_all(*current_buckets, *prev_buckets).subquery()
+        buckets = union_all(*current_buckets).subquery()
+
+        # Get aggregate metrics for both periods, and the change between
+        # them, in a single statement, splitting the rows with FILTER
+        current = periods.c.bucket >= start_date
+        previous = periods.c.bucket < start_date
+        total = _sum(periods.c.executions, current)
+        successful = _sum(periods.c.successful, current)
+        avg_time = _avg_time(periods, current)
+        cost = _sum(periods.c.cost_micro_usd, current)
+        success_rate = _percent(successful, total)
+        prev_total = _sum(periods.c.executions, previous)
+        prev_success_rate = _percent(_sum(periods.c.successful, previous), prev_total)
         metrics_query = select(
-            func.count().label("total"),
-            func.sum(case((self.model.status == ExecutionStatus.success, 1), else_=0)).label(
-                "successful"
-            ),
-            func.sum(case((self.model.status == ExecutionStatus.failure, 1), else_=0)).label(
-                "failed"
-            ),
-            func.avg(self.model.execution_time_ms).label("avg_time"),
-            func.sum(self.model.input_tokens).label("input_tokens"),
-            func.sum(self.model.output_tokens).label("output_tokens"),
-            func.sum(self.model.total_tokens).label("total_tokens"),
-            func.sum(self.model.cost_usd).label("total_cost"),
-        ).where(and_(*filters))
-
-        result = await db.execute(metrics_query)
-        metrics = result.first()
-
-        total_executions = metrics.total or 0
-        successful_executions = metrics.successful or 0
-        failed_executions = metrics.failed or 0
-        success_rate = (
-            (successful_executions / total_executions * 100)
-            if total_executions > 0
-            else 0.0
+            total.label("total"),
+            successful.label("successful"),
+            _sum(periods.c.failed, current).label("failed"),
+            func.coalesce(success_rate, 0.0).label("success_rate"),
+            avg_time.label("avg_time"),
+            _sum(periods.c.input_tokens, current).label("input_tokens"),
+            _sum(periods.c.output_tokens, current).label("output_tokens"),
+            _sum(periods.c.total_tokens, current).label("total_tokens"),
+            cost.label("total_cost"),
+            _change(total, prev_total).label("executions_change"),
+            _change(avg_time, _avg_time(periods, previous)).label("execution_time_change"),
+            _change(success_rate, prev_success_rate).label("success_rate_change"),
+            _change(cost, _sum(periods.c.cost_micro_usd, previous)).label("cost_change"),
         )
 
-        # Get percentile execution times
-        time_query = select(self.model.execution_time_ms).where(
-            and_(*filters, self.model.execution_time_ms > 0)
-        ).order_by(self.model.execution_time_ms)
-        time_result = await db.execute(time_query)
-        times = [r[0] for r in time_result.fetchall()]
-
-        p50 = times[len(times) // 2] if times else 0
-        p95 = times[int(len(times) * 0.95)] if times else 0
-        p99 = times[int(len(times) * 0.99)] if times else 0
-
+        # Percentiles cannot be combined from hourly buckets, so they still
+        # come from raw executions: p50/p95/p99 in one sort, over executions
+        # that recorded a time. Postgres computes them where the rows are;
+        # only the three values cross the wire, never the individual times
+        scope = [self.model.user_id == user_id] if user_id else []
+        percentiles_query = select(
+            func.percentile_cont(array([0.5, 0.95, 0.99])).within_group(
+                self.model.execution_time_ms
+            )
+        ).where(
+            self.model.started_at >= start_date,
+            self.model.started_at <= end_date,
+            self.model.execution_time_ms > 0,
+            *scope,
+        )
         # Get top agents
         top_agents_query = (
             select(
-                self.model.agent_name,
-                self.model.agent_id,
-                self.model.agent_type,
-                func.count().label("count"),
-                func.sum(case((self.model.status == ExecutionStatus.success, 1), else_=0)).label(
-                    "success_count"
-                ),
-                func.sum(case((self.model.status == ExecutionStatus.failure, 1), else_=0)).label(
-                    "failure_count"
-                ),
-                func.avg(self.model.execution_time_ms).label("avg_time"),
-                func.sum(self.model.total_tokens).label("total_tokens"),
-                func.sum(self.model.cost_usd).label("total_cost"),
+                buckets.c.agent_name,
+                buckets.c.agent_id,
+                buckets.c.agent_type,
+                _sum(buckets.c.executions).label("count"),
+                _sum(buckets.c.successful).label("success_count"),
+                _sum(buckets.c.failed).label("failure_count"),
+                _avg_time(buckets).label("avg_time"),
+                _sum(buckets.c.total_tokens).label("total_tokens"),
+                _sum(buckets.c.cost_micro_usd).label("total_cost"),
             )
-            .where(and_(*filters, self.model.agent_name.isnot(None)))
-            .group_by(self.model.agent_name, self.model.agent_id, self.model.agent_type)
+            .where(buckets.c.agent_name.isnot(None))
+            .group_by(buckets.c.agent_name, buckets.c.agent_id, buckets.c.agent_type)
             .order_by(desc("count"))
             .limit(10)
         )
-        top_agents_result = await db.execute(top_agents_query)
+        # Get cost breakdown by model
+        model_cost_query = (
+            select(
+                buckets.c.model_name,
+                _sum(buckets.c.cost_micro_usd).label("cost"),
+                _sum(buckets.c.executions).label("count"),
+                _sum(buckets.c.total_tokens).label("tokens"),
+            )
+            .where(buckets.c.model_name.isnot(None))
+            .group_by(buckets.c.model_name)
+            .order_by(desc("cost"))
+        )
+
+        # Count active agents
+        active_agents_query = select(
+            func.count(func.distinct(buckets.c.agent_id))
+        ).where(buckets.c.agent_id.isnot(None))
+
+        result = await db.execute(metrics_query)
+        metrics = result.first()
+
+        # Without executions in the period every breakdown is empty, so
+        # nothing else needs to be asked. Otherwise the four remaining
+        # queries are independent and run at the same time on separate
+        # pooled connections, after `db` has given its own back
+        p50 = p95 = p99 = 0
+        active_agents = 0
+        top_agents_rows = model_cost_rows = []
+        if metrics.total:
+            queries = (percentiles_query, top_agents_query, model_cost_query, active_agents_query)
+            if concurrent:
+                rows = await fetch_concurrently(db, *queries)
+            else:
+                rows = [(await db.execute(query)).all() for query in queries]
+            percentiles_rows, top_agents_rows, model_cost_rows, active_rows = rows
+            p50, p95, p99 = percentiles_rows[0][0] or (0, 0, 0)
+            active_agents = active_rows[0][0] or 0
+
         top_agents = [
             TopAgentDTO(
                 agent_name=row.agent_name or "Unknown",
@@ -255,84 +485,29 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
                 success_rate=(row.success_count or 0) / row.count * 100 if row.count > 0 else 0,
                 avg_execution_time_ms=float(row.avg_time or 0),
                 total_tokens=row.total_tokens or 0,
-                total_cost_usd=Decimal(str(row.total_cost or 0)),
+                total_cost_usd=row.total_cost or Decimal(0),
             )
-            for row in top_agents_result.fetchall()
+            for row in top_agents_rows
         ]
 
-        # Get cost breakdown by model
-        model_cost_query = (
-            select(
-                self.model.model_name,
-                func.sum(self.model.cost_usd).label("cost"),
-                func.count().label("count"),
-                func.sum(self.model.total_tokens).label("tokens"),
-            )
-            .where(and_(*filters, self.model.model_name.isnot(None)))
-            .group_by(self.model.model_name)
-            .order_by(desc("cost"))
-        )
-        model_cost_result = await db.execute(model_cost_query)
-        total_cost = Decimal(str(metrics.total_cost or 0))
+        total_cost = metrics.total_cost or Decimal(0)
         cost_by_model = [
             CostBreakdownDTO(
                 name=row.model_name or "Unknown",
                 category="model",
-                total_cost_usd=Decimal(str(row.cost or 0)),
+                total_cost_usd=row.cost or Decimal(0),
                 percentage=float(row.cost / total_cost * 100) if total_cost > 0 else 0,
                 execution_count=row.count,
                 total_tokens=row.tokens or 0,
             )
-            for row in model_cost_result.fetchall()
+            for row in model_cost_rows
         ]
 
-        # Calculate comparison with previous period
-        period_length = end_date - start_date
-        prev_start = start_date - period_length
-        prev_end = start_date
-
-        prev_filters = [
-            self.model.started_at >= prev_start,
-            self.model.started_at < prev_end,
-        ]
-        if user_id:
-            prev_filters.append(self.model.user_id == user_id)
-
-        prev_query = select(
-            func.count().label("total"),
-            func.sum(case((self.model.status == ExecutionStatus.success, 1), else_=0)).label(
-                "successful"
-            ),
-            func.avg(self.model.execution_time_ms).label("avg_time"),
-            func.sum(self.model.cost_usd).label("total_cost"),
-        ).where(and_(*prev_filters))
-
-        prev_result = await db.execute(prev_query)
-        prev_metrics = prev_result.first()
-
-        prev_total = prev_metrics.total or 0
-        prev_successful = prev_metrics.successful or 0
-        prev_success_rate = (prev_successful / prev_total * 100) if prev_total > 0 else 0
-        prev_avg_time = float(prev_metrics.avg_time or 0)
-        prev_cost = Decimal(str(prev_metrics.total_cost or 0))
-
-        def calc_change(current: float, previous: float) -> Optional[float]:
-            if previous == 0:
-                return None
-            return ((current - previous) / previous) * 100
-
-        # Count active agents
-        active_agents_query = select(
-            func.count(func.distinct(self.model.agent_id))
-        ).where(and_(*filters, self.model.agent_id.isnot(None)))
-        active_result = await db.execute(active_agents_query)
-        active_agents = active_result.scalar() or 0
-
         return AnalyticsOverviewDTO(
-            total_executions=total_executions,
-            successful_executions=successful_executions,
-            failed_executions=failed_executions,
-            success_rate=success_rate,
+            total_executions=metrics.total or 0,
+            successful_executions=metrics.successful or 0,
+            failed_executions=metrics.failed or 0,
+            success_rate=metrics.success_rate,
             avg_execution_time_ms=float(metrics.avg_time or 0),
             p50_execution_time_ms=float(p50),
             p95_execution_time_ms=float(p95),
@@ -342,10 +517,10 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
             total_tokens=metrics.total_tokens or 0,
             total_cost_usd=total_cost,
             estimated_monthly_cost_usd=total_cost * 30 / max(period_length.days, 1),
-            executions_change_percent=calc_change(float(total_executions), float(prev_total)),
-            execution_time_change_percent=calc_change(float(metrics.avg_time or 0), prev_avg_time),
-            success_rate_change_percent=calc_change(success_rate, prev_success_rate),
-            cost_change_percent=calc_change(float(total_cost), float(prev_cost)),
+            executions_change_percent=metrics.executions_change,
+            execution_time_change_percent=metrics.execution_time_change,
+            success_rate_change_percent=metrics.success_rate_change,
+            cost_change_percent=metrics.cost_change,
             active_agents_count=active_agents,
             top_agents=top_agents,
             cost_by_model=cost_by_model,
@@ -354,14 +529,14 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
     async def get_agent_stats(
         self,
         db: AsyncSession,
-        agent_id: str,
-        user_id: Optional[str] = None,
+        agent_id: UUID,
+        user_id: Optional[UUID] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> Optional[AgentStatsDTO]:
         """Get detailed statistics for a specific agent."""
         if not end_date:
-            end_date = datetime.utcnow()
+            end_date = datetime.now(timezone.utc)
         if not start_date:
             start_date = end_date - timedelta(days=30)
 
@@ -378,16 +553,14 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
             self.model.agent_name,
             self.model.agent_type,
             func.count().label("total"),
-            func.sum(case((self.model.status == ExecutionStatus.success, 1), else_=0)).label(
-                "successful"
-            ),
-            func.sum(case((self.model.status == ExecutionStatus.failure, 1), else_=0)).label(
-                "failed"
-            ),
-            func.sum(case((self.model.status == ExecutionStatus.timeout, 1), else_=0)).label(
-                "timeout"
-            ),
+            func.count().filter(self.model.status == ExecutionStatus.success).label("successful"),
+            func.count().filter(self.model.status == ExecutionStatus.failure).label("failed"),
+            func.count().filter(self.model.status == ExecutionStatus.timeout).label("timeout"),
             func.avg(self.model.execution_time_ms).label("avg_time"),
+            # Both percentiles from one sort, in the same scan as the rest
+            func.percentile_cont(array([0.5, 0.95]))
+            .within_group(self.model.execution_time_ms)
+            .label("percentiles"),
             func.min(self.model.execution_time_ms).label("min_time"),
             func.max(self.model.execution_time_ms).label("max_time"),
             func.avg(self.model.input_tokens).label("avg_input"),
@@ -406,6 +579,7 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
 
         total = stats.total or 0
         successful = stats.successful or 0
+        p50, p95 = stats.percentiles or (0, 0)
 
         return AgentStatsDTO(
             agent_id=agent_id,
@@ -417,13 +591,15 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
             timeout_executions=stats.timeout or 0,
             success_rate=(successful / total * 100) if total > 0 else 0,
             avg_execution_time_ms=float(stats.avg_time or 0),
+            p50_execution_time_ms=p50 or 0,
+            p95_execution_time_ms=p95 or 0,
             min_execution_time_ms=stats.min_time or 0,
             max_execution_time_ms=stats.max_time or 0,
             avg_input_tokens=float(stats.avg_input or 0),
             avg_output_tokens=float(stats.avg_output or 0),
             total_tokens=stats.total_tokens or 0,
-            total_cost_usd=Decimal(str(stats.total_cost or 0)),
-            avg_cost_per_execution_usd=Decimal(str(stats.total_cost or 0)) / total if total > 0 else Decimal("0"),
+            total_cost_usd=stats.total_cost or Decimal(0),
+            avg_cost_per_execution_usd=(stats.total_cost or Decimal(0)) / total if total > 0 else Decimal("0"),
             last_executed_at=stats.last_executed,
             first_executed_at=stats.first_executed,
         )
@@ -431,73 +607,53 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
     async def get_cost_summary(
         self,
         db: AsyncSession,
-        user_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
     ) -> dict:
         """Get cost summary breakdown."""
         if not end_date:
-            end_date = datetime.utcnow()
+            end_date = datetime.now(timezone.utc)
         if not start_date:
             start_date = end_date - timedelta(days=30)
 
-        filters = [
-            self.model.started_at >= start_date,
-            self.model.started_at <= end_date,
-        ]
-        if user_id:
-            filters.append(self.model.user_id == user_id)
+        cutoff = await execution_rollup_cutoff(db, user_id)
+        buckets = union_all(*execution_buckets(start_date, end_date, cutoff, user_id)).subquery()
 
         # Total cost
-        total_query = select(func.sum(self.model.cost_usd)).where(and_(*filters))
+        total_query = select(_sum(buckets.c.cost_micro_usd))
         total_result = await db.execute(total_query)
-        total_cost = Decimal(str(total_result.scalar() or 0))
+        total_cost = total_result.scalar() or Decimal(0)
 
-        # By model
+        # By model and by agent. Rows come back in the response's shape, with
+        # each group's share of the total cost taken from a window over the groups
+        cost = func.coalesce(_sum(buckets.c.cost_micro_usd), 0)
         by_model_query = (
             select(
-                self.model.model_name,
-                func.sum(self.model.cost_usd).label("cost"),
-                func.count().label("count"),
+                func.coalesce(buckets.c.model_name, "Unknown").label("model"),
+                cost.label("cost_usd"),
+                _sum(buckets.c.executions).label("execution_count"),
+                _share(cost).label("percentage"),
             )
-            .where(and_(*filters))
-            .group_by(self.model.model_name)
-            .order_by(desc("cost"))
+            .group_by(buckets.c.model_name)
+            .order_by(desc("cost_usd"))
         )
         by_model_result = await db.execute(by_model_query)
-        by_model = [
-            {
-                "model": row.model_name or "Unknown",
-                "cost_usd": Decimal(str(row.cost or 0)),
-                "execution_count": row.count,
-                "percentage": float(row.cost / total_cost * 100) if total_cost > 0 else 0,
-            }
-            for row in by_model_result.fetchall()
-        ]
+        by_model = [dict(row._mapping) for row in by_model_result]
 
-        # By agent
         by_agent_query = (
             select(
-                self.model.agent_name,
-                self.model.agent_id,
-                func.sum(self.model.cost_usd).label("cost"),
-                func.count().label("count"),
+                func.coalesce(buckets.c.agent_name, "Unknown").label("agent_name"),
+                cast(buckets.c.agent_id, String).label("agent_id"),
+                cost.label("cost_usd"),
+                _sum(buckets.c.executions).label("execution_count"),
+                _share(cost).label("percentage"),
             )
-            .where(and_(*filters))
-            .group_by(self.model.agent_name, self.model.agent_id)
-            .order_by(desc("cost"))
+            .group_by(buckets.c.agent_name, buckets.c.agent_id)
+            .order_by(desc("cost_usd"))
         )
         by_agent_result = await db.execute(by_agent_query)
-        by_agent = [
-            {
-                "agent_name": row.agent_name or "Unknown",
-                "agent_id": str(row.agent_id) if row.agent_id else None,
-                "cost_usd": Decimal(str(row.cost or 0)),
-                "execution_count": row.count,
-                "percentage": float(row.cost / total_cost * 100) if total_cost > 0 else 0,
-            }
-            for row in by_agent_result.fetchall()
-        ]
+        by_agent = [dict(row._mapping) for row in by_agent_result]
 
         return {
             "total_cost_usd": total_cost,
@@ -506,34 +662,87 @@ class AgentExecutionRepository(CRUDBase[AgentExecution, AgentExecutionCreate, Ag
             "by_agent": by_agent,
         }
 
+    async def get_model_comparison(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> List[dict]:
+        """Per-model execution, timing, token and cost metrics, busiest model first."""
+        ae = self.model
+        query = (
+            select(
+                ae.model_name,
+                func.count().label("execution_count"),
+                func.count().filter(ae.status == ExecutionStatus.success).label("success_count"),
+                func.avg(ae.execution_time_ms).label("avg_execution_time_ms"),
+                # Same-ordered percentiles share one sort per model in Postgres
+                *(
+                    func.percentile_cont(fraction).within_group(ae.execution_time_ms).label(label)
+                    for fraction, label in ((0.5, "p50"), (0.95, "p95"), (0.99, "p99"))
+                ),
+                func.avg(ae.total_tokens).label("avg_tokens"),
+                func.sum(ae.total_tokens).label("total_tokens"),
+                func.sum(ae.cost_usd).label("total_cost"),
+            )
+            .where(
+                ae.user_id == user_id,
+                ae.started_at >= start_date,
+                ae.started_at <= end_date,
+                ae.model_name.isnot(None),
+            )
+            .group_by(ae.model_name)
+            .order_by(desc("execution_count"))
+        )
+        result = await db.execute(query)
+
+        return [
+            {
+                "model_name": row.model_name,
+                "execution_count": row.execution_count,
+                "success_count": row.success_count,
+                "success_rate": row.success_count / row.execution_count * 100
+                if row.execution_count > 0
+                else 0,
+                "avg_execution_time_ms": float(row.avg_execution_time_ms or 0),
+                "p50_execution_time_ms": row.p50 or 0,
+                "p95_execution_time_ms": row.p95 or 0,
+                "p99_execution_time_ms": row.p99 or 0,
+                "avg_tokens": float(row.avg_tokens or 0),
+                "total_tokens": row.total_tokens or 0,
+                "total_cost_usd": str(row.total_cost or 0),
+            }
+            for row in result
+        ]
+
     async def get_cost_forecast(
         self,
         db: AsyncSession,
-        user_id: Optional[str] = None,
+        user_id: Optional[UUID] = None,
     ) -> CostForecastDTO:
         """Get cost forecast based on recent usage."""
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         last_7_days = now - timedelta(days=7)
         prev_7_days = last_7_days - timedelta(days=7)
 
-        filters_current = [self.model.started_at >= last_7_days]
-        filters_prev = [
-            self.model.started_at >= prev_7_days,
-            self.model.started_at < last_7_days,
-        ]
-        if user_id:
-            filters_current.append(self.model.user_id == user_id)
-            filters_prev.append(self.model.user_id == user_id)
-
-        # Current period cost
-        current_query = select(func.sum(self.model.cost_usd)).where(and_(*filters_current))
-        current_result = await db.execute(current_query)
-        current_cost = Decimal(str(current_result.scalar() or 0))
+        # Both weeks in one statement over the hourly rollup and the raw
+        # edges of each week, split with FILTER. Every rollup bucket lies
+        # entirely inside one week, so the split on bucket is exact
+        cutoff = await execution_rollup_cutoff(db, user_id)
+        weeks = union_all(
+            *execution_buckets(last_7_days, now, cutoff, user_id),
+            *execution_buckets(prev_7_days, last_7_days, cutoff, user_id, include_end=False),
+        ).subquery()
+        query = select(
+            _sum(weeks.c.cost_micro_usd, weeks.c.bucket >= last_7_days).label("current"),
+            _sum(weeks.c.cost_micro_usd, weeks.c.bucket < last_7_days).label("previous"),
+        )
 
-        # Previous period cost
-        prev_query = select(func.sum(self.model.cost_usd)).where(and_(*filters_prev))
-        prev_result = await db.execute(prev_query)
-        prev_cost = Decimal(str(prev_result.scalar() or 0))
+        result = await db.execute(query)
+        costs = result.first()
+        current_cost = costs.current or Decimal(0)
+        prev_cost = costs.previous or Decimal(0)
 
         daily_avg = current_cost / 7
         weekly_projected = current_cost
@@ -566,13 +775,16 @@ class TokenUsageRepository(CRUDBase[TokenUsage, TokenUsageCreate, TokenUsageCrea
     """Repository for token usage records."""
 
     async def get_by_execution(
-        self, db: AsyncSession, execution_id: str
+        self, db: AsyncSession, execution_id: UUID
     ) -> List[TokenUsage]:
         """Get all token usage records for an execution."""
+        model = self.model
         result = await db.execute(
-            select(self.model)
-            .where(self.model.execution_id == execution_id)
-            .order_by(self.model.step_number)
+            lambda_stmt(
+                lambda: select(model)
+                .where(model.execution_id == execution_id)
+                .order_by(model.step_number)
+            )
         )
         return result.scalars().all()
 
@@ -581,58 +793,160 @@ class ExecutionTraceRepository(CRUDBase[ExecutionTrace, ExecutionTraceCreate, Ex
     """Repository for execution trace records."""
 
     async def get_by_execution(
-        self, db: AsyncSession, execution_id: str
+        self, db: AsyncSession, execution_id: UUID
     ) -> List[ExecutionTrace]:
         """Get all trace records for an execution."""
+        model = self.model
         result = await db.execute(
-            select(self.model)
-            .where(self.model.execution_id == execution_id)
-            .order_by(self.model.step_number)
+            lambda_stmt(
+                lambda: select(model)
+                .where(model.execution_id == execution_id)
+                .order_by(model.step_number)
+            )
         )
         return result.scalars().all()
 
 
+class ModelPricingRepository(CRUDBase[ModelPricing, ModelPricingCreate, ModelPricingCreate]):
+    """Repository for per-model token prices."""
+
+    # Fallback for models missing from the pricing table (input, output per 1K)
+    DEFAULT_PRICE = (Decimal("0.001"), Decimal("0.002"))
+
+    async def get_price(self, db: AsyncSession, model_name: Optional[str]) -> Tuple[Decimal, Decimal]:
+        """Input and output price per 1K tokens of `model_name`.
+
+        Looked up by primary key on every call, so an updated price applies
+        to the next execution without a restart.
+        """
+        if model_name is None:
+            return self.DEFAULT_PRICE
+        result = await db.execute(
+            select(self.model.input_cost_per_1k, self.model.output_cost_per_1k).where(
+                self.model.model_name == model_name
+            )
+        )
+        row = result.first()
+        return (row.input_cost_per_1k, row.output_cost_per_1k) if row else self.DEFAULT_PRICE
+
+    async def calculate_cost(
+        self, db: AsyncSession, model_name: Optional[str], input_tokens: int, output_tokens: int
+    ) -> Decimal:
+        """Cost in USD of a call to `model_name` with the given token counts."""
+        input_cost, output_cost = await self.get_price(db, model_name)
+        return (input_tokens * input_cost + output_tokens * output_cost) / 1000
+
+
 class BudgetAlertRepository(CRUDBase[BudgetAlert, BudgetAlertCreate, BudgetAlertUpdate]):
     """Repository for budget alerts."""
 
+    async def create(
+        self, db: AsyncSession, *, obj_in: Union[BudgetAlertCreate, BudgetAlert]
+    ) -> BudgetAlert:
+        alert = await super().create(db, obj_in=obj_in)
+        return await self._refresh_current_spend(db, alert)
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: BudgetAlert,
+        obj_in: Union[BudgetAlertUpdate, dict[str, Any]],
+    ) -> BudgetAlert:
+        alert = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        return await self._refresh_current_spend(db, alert)
+
+    async def delete_for_user(self, db: AsyncSession, alert_id: UUID, user_id: UUID) -> bool:
+        """Delete the alert if it belongs to the user, in a single statement.
+
+        Returns False when nothing was deleted, whether the alert does not
+        exist or belongs to someone else.
+        """
+        result = await db.execute(
+            delete(self.model)
+            .where(self.model.id == alert_id, self.model.user_id == user_id)
+            .returning(self.model.id)
+        )
+        await db.commit()
+        return result.scalar() is not None
+
+    async def _refresh_current_spend(self, db: AsyncSession, alert: BudgetAlert) -> BudgetAlert:
+        """Fill in spend from history; the trigger only adds executions written later."""
+        await refresh_budget_spend(db, alert.id)
+        await db.commit()
+        await db.refresh(alert)
+        return alert
+
     async def get_active_by_user(
-        self, db: AsyncSession, user_id: str
+        self, db: AsyncSession, user_id: UUID
     ) -> List[BudgetAlert]:
         """Get all active budget alerts for a user."""
+        model = self.model
         result = await db.execute(
-            select(self.model).where(
-                and_(
-                    self.model.user_id == user_id,
-                    self.model.is_active.is_(True),
+            lambda_stmt(
+                lambda: select(model).where(
+                    and_(
+                        model.user_id == user_id,
+                        model.is_active.is_(True),
+                    )
                 )
             )
         )
         return result.scalars().all()
 
     async def check_budget_exceeded(
-        self, db: AsyncSession, user_id: str
+        self, db: AsyncSession, user_id: UUID
     ) -> List[Tuple[BudgetAlert, Decimal]]:
-        """Check if any budgets are exceeded and return alerts with current spend."""
-        alerts = await self.get_active_by_user(db, user_id)
-        exceeded = []
+        """Check if any budgets are exceeded and return alerts with current spend.
 
-        for alert in alerts:
-            # Calculate current spend for the period
-            start_date = datetime.utcnow() - timedelta(days=alert.period_days)
-
-            filters = [
-                AgentExecution.user_id == user_id,
-                AgentExecution.started_at >= start_date,
+        Every alert's spend is summed by one statement: the alerts' windows go
+        in as a VALUES list that is outer joined to the user's executions and
+        grouped per alert.
+        """
+        alerts = await self.get_active_by_user(db, user_id)
+        if not alerts:
+            return []
+
+        # Calculate current spend for each alert's period
+        now = datetime.now(timezone.utc)
+        windows = values(
+            column("alert_id", Uuid),
+            column("start_date", DateTime(timezone=True)),
+            column("agent_id", Uuid),
+            name="alert_windows",
+        ).data(
+            [
+                (
+                    alert.id,
+                    now - timedelta(days=alert.period_days),
+                    alert.scope_id if alert.scope == BudgetScope.agent else None,
+                )
+                for alert in alerts
             ]
+        )
+        query = (
+            select(windows.c.alert_id, func.sum(AgentExecution.cost_usd).label("spend"))
+            .select_from(windows)
+            .outerjoin(
+                AgentExecution,
+                and_(
+                    AgentExecution.user_id == user_id,
+                    AgentExecution.started_at >= windows.c.start_date,
+                    or_(
+                        windows.c.agent_id.is_(None),
+                        AgentExecution.agent_id == windows.c.agent_id,
+                    ),
+                ),
+            )
+            .group_by(windows.c.alert_id)
+        )
+        result = await db.execute(query)
+        spend_by_alert = {row.alert_id: row.spend for row in result}
 
-            if alert.scope.value == "agent" and alert.scope_id:
-                filters.append(AgentExecution.agent_id == alert.scope_id)
-
-            query = select(func.sum(AgentExecution.cost_usd)).where(and_(*filters))
-            result = await db.execute(query)
-            current_spend = Decimal(str(result.scalar() or 0))
-
-            threshold = alert.threshold_usd * Decimal(str(alert.alert_at_percentage)) / 100
+        exceeded = []
+        for alert in alerts:
+            current_spend = spend_by_alert.get(alert.id) or Decimal(0)
+            threshold = alert.threshold_usd * Decimal(alert.alert_at_percentage) / 100
 
             if current_spend >= threshold:
                 exceeded.append((alert, current_spend))
@@ -645,3 +959,4 @@ agent_execution_repo = AgentExecutionRepository(AgentExecution)
 token_usage_repo = TokenUsageRepository(TokenUsage)
 execution_trace_repo = ExecutionTraceRepository(ExecutionTrace)
 budget_alert_repo = BudgetAlertRepository(BudgetAlert)
+model_pricing_repo = ModelPricingRepository(ModelPricing)
@@ -5,7 +5,7 @@ from fastapi import HTTPException
 from sqlalchemy import and_, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import selectinload
 from src.models import ChatConversation, ChatMessage, User
 from src.repositories.base import CRUDBase
 from src.schemas.api.chat.dto import BaseChatDTO, ChatDetailsDTO, ListChatsDTO
@@ -35,7 +35,7 @@ class ChatRepository(
     ):
         q = await db.execute(
             select(self.model)
-            .options(joinedload(self.model.messages))
+            .options(selectinload(self.model.messages))
             .where(
                 and_(
                     self.model.session_id == session_id,
@@ -98,7 +98,7 @@ class ChatRepository(
     ):
         q = await db.execute(
             select(self.model)
-            .options(joinedload(self.model.messages))
+            .options(selectinload(self.model.messages))
             .where(
                 and_(
                     self.model.session_id == session_id,
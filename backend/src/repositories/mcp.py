@@ -1,7 +1,7 @@
 import logging
 import traceback
 import uuid
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Optional
 from uuid import UUID
 
@@ -112,7 +112,6 @@ class MCPRepository(CRUDBase[MCPServer, MCPToolSchema, MCPToolSchema]):
                     "alias", generate_alias(t.name)
                 ),
                 "mcp_server_id": db_obj.id,
-                "updated_at": datetime.now(),
             }
             for t in tools_in
         ]
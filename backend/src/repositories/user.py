@@ -48,6 +48,16 @@ class UserRepository(CRUDBase[User, UserCreate, UserUpdate]):
             update_data["hashed_password"] = hashed_password
         return await super().update(db, db_obj=db_obj, obj_in=update_data)
 
+    async def get(self, db: AsyncSession, id_: Any) -> Optional[User]:
+        # Session.get() answers from the session's identity map when the user
+        # was already loaded in this request (token check, then handlers), and
+        # only goes to the database on the first lookup
+        try:
+            key = id_ if isinstance(id_, UUID) else UUID(str(id_))
+        except ValueError:
+            return None
+        return await db.get(User, key)
+
     async def get_user_by_username(
         self, db: AsyncSession, *, username: str
     ) -> Optional[User]:
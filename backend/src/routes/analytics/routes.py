@@ -1,15 +1,19 @@
-from datetime import datetime, timedelta
-from typing import Annotated, List, Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
+from typing import Annotated, AsyncIterator, Awaitable, Callable, List, NamedTuple, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 import csv
 import io
 import json
 
 from src.auth.dependencies import CurrentUserDependency
-from src.db.session import AsyncDBSession
+from src.core.settings import get_settings
+from src.db.session import AsyncDBSession, run_concurrently
 from src.repositories.analytics import (
     agent_execution_repo,
     budget_alert_repo,
@@ -22,43 +26,88 @@ from src.schemas.api.analytics.dto import (
     AnalyticsOverviewDTO,
     BudgetAlertDTO,
     CostForecastDTO,
-    ExecutionTraceDTO,
+    DashboardDTO,
     PaginatedExecutionsDTO,
-    TokenUsageDTO,
 )
 from src.schemas.api.analytics.schemas import (
     BudgetAlertCreate,
     BudgetAlertUpdate,
+    ExportFileFormat,
+    Period,
+    SortOrder,
 )
-from src.utils.enums import ExecutionStatus
+from src.utils.cache import cached_json_response, generation, next_generation
+from src.utils.enums import AgentType, ExecutionStatus
+from src.utils.exceptions import InvalidCursor
+
+settings = get_settings()
 
 analytics_router = APIRouter(tags=["Analytics"], prefix="/analytics")
 
 
-def parse_period(period: str) -> tuple[datetime, datetime]:
-    """Parse period string into start and end dates."""
-    now = datetime.utcnow()
-    if period == "24h":
-        return now - timedelta(hours=24), now
-    elif period == "7d":
-        return now - timedelta(days=7), now
-    elif period == "30d":
-        return now - timedelta(days=30), now
-    elif period == "90d":
-        return now - timedelta(days=90), now
-    else:
-        # Default to 24h
-        return now - timedelta(hours=24), now
+PERIOD_LENGTHS: dict[Period, timedelta] = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "90d": timedelta(days=90),
+}
+
+
+@lru_cache(maxsize=32)
+def _period_bounds(period: Period, minute: int) -> tuple[datetime, datetime]:
+    end = datetime.fromtimestamp((minute + 1) * 60, timezone.utc)
+    return end - PERIOD_LENGTHS[period], end
+
+
+def parse_period(period: Period) -> tuple[datetime, datetime]:
+    """Parse period string into start and end dates.
+
+    The end is the start of the next UTC minute rather than the current
+    instant, so every request within a minute asks for the same window.
+    Nothing can have started after it yet, so no executions are missed.
+    Bounds are memoized per period and minute.
+    """
+    return _period_bounds(period, int(datetime.now(timezone.utc).timestamp()) // 60)
+
+
+class PeriodRange(NamedTuple):
+    start_date: datetime
+    end_date: datetime
+    # The period as requested, e.g. "7d", or the explicit start and end
+    label: str
+
+
+def resolve_period(default: Period) -> Callable[..., Awaitable[PeriodRange]]:
+    """Dependency resolving the `period`, `start_date` and `end_date` query parameters.
+
+    An explicit start and end win over `period`, which falls back to `default`.
+    """
+
+    async def resolve(
+        period: Annotated[Period, Query(description="Time period: 24h, 7d, 30d, 90d")] = default,
+        start_date: Annotated[Optional[datetime], Query()] = None,
+        end_date: Annotated[Optional[datetime], Query()] = None,
+    ) -> PeriodRange:
+        if start_date and end_date:
+            return PeriodRange(
+                start_date, end_date, f"{start_date.isoformat()}:{end_date.isoformat()}"
+            )
+        return PeriodRange(*parse_period(period), period)
+
+    return resolve
+
+
+def range_cache_key(name: str, user_id: UUID, period_range: PeriodRange) -> str:
+    """Cache key for a per-user response over a period or an explicit range."""
+    return f"analytics:{name}:{user_id}:{period_range.label}"
 
 
 @analytics_router.get("/overview", response_model=AnalyticsOverviewDTO)
 async def get_analytics_overview(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-    period: Annotated[str, Query(description="Time period: 24h, 7d, 30d, 90d")] = "24h",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
-) -> AnalyticsOverviewDTO:
+    period_range: Annotated[PeriodRange, Depends(resolve_period("24h"))],
+) -> Response:
     """
     Get analytics overview for the dashboard.
 
@@ -69,35 +118,96 @@ async def get_analytics_overview(
     - Cost summary
     - Top agents by usage
     - Cost breakdown by model
+
+    Responses are cached per user and range for ANALYTICS_CACHE_TTL_SECONDS.
     """
-    if start_date and end_date:
-        pass  # Use provided dates
-    else:
-        start_date, end_date = parse_period(period)
+    cache_key = range_cache_key("overview", user.id, period_range)
+
+    return await cached_json_response(
+        cache_key,
+        lambda: agent_execution_repo.get_overview(
+            db=db,
+            user_id=user.id,
+            start_date=period_range.start_date,
+            end_date=period_range.end_date,
+        ),
+        ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
+    )
 
-    return await agent_execution_repo.get_overview(
-        db=db,
-        user_id=str(user.id),
-        start_date=start_date,
-        end_date=end_date,
+
+@analytics_router.get("/dashboard", response_model=DashboardDTO)
+async def get_dashboard(
+    db: AsyncDBSession,
+    user: CurrentUserDependency,
+    period_range: Annotated[PeriodRange, Depends(resolve_period("24h"))],
+) -> Response:
+    """
+    Get the overview, cost summary, cost forecast and model comparison at once.
+
+    The four are computed concurrently over the same range, each on one
+    pooled connection, so loading the dashboard takes one request and about
+    as long as the slowest of them.
+
+    Responses are cached per user and range for ANALYTICS_CACHE_TTL_SECONDS.
+    """
+    cache_key = range_cache_key("dashboard", user.id, period_range)
+
+    async def dashboard() -> DashboardDTO:
+        overview, cost_summary, cost_forecast, model_comparison = await run_concurrently(
+            db,
+            lambda session: agent_execution_repo.get_overview(
+                db=session,
+                user_id=user.id,
+                start_date=period_range.start_date,
+                end_date=period_range.end_date,
+                # Already one of four concurrent calls; fanning out again
+                # would hold up to eight connections per request
+                concurrent=False,
+            ),
+            lambda session: agent_execution_repo.get_cost_summary(
+                db=session,
+                user_id=user.id,
+                start_date=period_range.start_date,
+                end_date=period_range.end_date,
+            ),
+            lambda session: agent_execution_repo.get_cost_forecast(db=session, user_id=user.id),
+            lambda session: agent_execution_repo.get_model_comparison(
+                db=session,
+                user_id=user.id,
+                start_date=period_range.start_date,
+                end_date=period_range.end_date,
+            ),
+        )
+        return DashboardDTO(
+            overview=overview,
+            cost_summary=cost_summary,
+            cost_forecast=cost_forecast,
+            model_comparison=model_comparison,
+        )
+
+    return await cached_json_response(
+        cache_key, dashboard, ttl=settings.ANALYTICS_CACHE_TTL_SECONDS
     )
 
 
-@analytics_router.get("/executions", response_model=PaginatedExecutionsDTO)
+@analytics_router.get(
+    "/executions",
+    response_model=PaginatedExecutionsDTO,
+    response_model_exclude_none=True,
+)
 async def list_executions(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-    period: Annotated[str, Query()] = "24h",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
+    period_range: Annotated[PeriodRange, Depends(resolve_period("24h"))],
     agent_id: Annotated[Optional[UUID], Query()] = None,
-    agent_type: Annotated[Optional[str], Query()] = None,
+    agent_type: Annotated[Optional[AgentType], Query()] = None,
     model_name: Annotated[Optional[str], Query()] = None,
     status: Annotated[Optional[ExecutionStatus], Query()] = None,
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=100)] = 20,
     sort_by: Annotated[str, Query()] = "started_at",
-    sort_order: Annotated[str, Query()] = "desc",
+    sort_order: Annotated[SortOrder, Query()] = "desc",
+    cursor: Annotated[Optional[str], Query()] = None,
 ) -> PaginatedExecutionsDTO:
     """
     Get paginated list of agent executions.
@@ -107,29 +217,35 @@ async def list_executions(
     - Agent ID and type
     - Model name
     - Execution status
-    """
-    if start_date and end_date:
-        pass
-    else:
-        start_date, end_date = parse_period(period)
 
-    return await agent_execution_repo.list_paginated(
-        db=db,
-        user_id=str(user.id),
-        agent_id=str(agent_id) if agent_id else None,
-        agent_type=agent_type,
-        model_name=model_name,
-        status=status,
-        start_date=start_date,
-        end_date=end_date,
-        page=page,
-        page_size=page_size,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    Pass the previous page's `next_cursor` as `cursor` to page deep into the
+    list without an OFFSET scan.
+    """
+    try:
+        return await agent_execution_repo.list_paginated(
+            db=db,
+            user_id=user.id,
+            agent_id=agent_id,
+            agent_type=agent_type,
+            model_name=model_name,
+            status=status,
+            start_date=period_range.start_date,
+            end_date=period_range.end_date,
+            page=page,
+            page_size=page_size,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
 
 
-@analytics_router.get("/executions/{execution_id}", response_model=AgentExecutionDTO)
+@analytics_router.get(
+    "/executions/{execution_id}",
+    response_model=AgentExecutionDTO,
+    response_model_exclude_none=True,
+)
 async def get_execution_details(
     db: AsyncDBSession,
     user: CurrentUserDependency,
@@ -144,86 +260,29 @@ async def get_execution_details(
     - Token usage breakdown
     """
     execution = await agent_execution_repo.get_with_details(
-        db=db, execution_id=str(execution_id)
+        db=db, execution_id=execution_id
     )
 
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
 
     # Check user access
-    if execution.user_id and str(execution.user_id) != str(user.id):
+    if execution.user_id and execution.user_id != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
-    traces = [
-        ExecutionTraceDTO(
-            id=str(t.id),
-            execution_id=str(t.execution_id),
-            step_number=t.step_number,
-            step_type=t.step_type,
-            content=t.content,
-            invoked_agent_id=str(t.invoked_agent_id) if t.invoked_agent_id else None,
-            invoked_agent_name=t.invoked_agent_name,
-            timestamp=t.timestamp,
-            duration_ms=t.duration_ms,
-            input_tokens=t.input_tokens,
-            output_tokens=t.output_tokens,
-        )
-        for t in execution.traces
-    ]
-
-    token_usages = [
-        TokenUsageDTO(
-            id=str(tu.id),
-            execution_id=str(tu.execution_id),
-            component=tu.component,
-            step_number=tu.step_number,
-            input_tokens=tu.input_tokens,
-            output_tokens=tu.output_tokens,
-            model=tu.model,
-            cost_usd=tu.cost_usd,
-            created_at=tu.created_at,
-        )
-        for tu in execution.token_usages
-    ]
-
-    return AgentExecutionDTO(
-        id=str(execution.id),
-        request_id=str(execution.request_id),
-        session_id=str(execution.session_id),
-        agent_id=str(execution.agent_id) if execution.agent_id else None,
-        agent_type=execution.agent_type,
-        agent_name=execution.agent_name,
-        user_id=str(execution.user_id) if execution.user_id else None,
-        model_config_id=str(execution.model_config_id) if execution.model_config_id else None,
-        model_name=execution.model_name,
-        started_at=execution.started_at,
-        completed_at=execution.completed_at,
-        status=execution.status,
-        error_message=execution.error_message,
-        error_type=execution.error_type,
-        input_tokens=execution.input_tokens,
-        output_tokens=execution.output_tokens,
-        total_tokens=execution.total_tokens,
-        execution_time_ms=execution.execution_time_ms,
-        llm_time_ms=execution.llm_time_ms,
-        cost_usd=execution.cost_usd,
-        parent_execution_id=str(execution.parent_execution_id) if execution.parent_execution_id else None,
-        query_preview=execution.query_preview,
-        created_at=execution.created_at,
-        updated_at=execution.updated_at,
-        traces=traces,
-        token_usages=token_usages,
-    )
+    return AgentExecutionDTO.model_validate(execution)
 
 
-@analytics_router.get("/agents/{agent_id}/stats", response_model=AgentStatsDTO)
+@analytics_router.get(
+    "/agents/{agent_id}/stats",
+    response_model=AgentStatsDTO,
+    response_model_exclude_none=True,
+)
 async def get_agent_stats(
     db: AsyncDBSession,
     user: CurrentUserDependency,
     agent_id: UUID,
-    period: Annotated[str, Query()] = "30d",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
+    period_range: Annotated[PeriodRange, Depends(resolve_period("30d"))],
 ) -> AgentStatsDTO:
     """
     Get detailed statistics for a specific agent.
@@ -235,17 +294,12 @@ async def get_agent_stats(
     - Cost totals and averages
     - Error analysis
     """
-    if start_date and end_date:
-        pass
-    else:
-        start_date, end_date = parse_period(period)
-
     stats = await agent_execution_repo.get_agent_stats(
         db=db,
-        agent_id=str(agent_id),
-        user_id=str(user.id),
-        start_date=start_date,
-        end_date=end_date,
+        agent_id=agent_id,
+        user_id=user.id,
+        start_date=period_range.start_date,
+        end_date=period_range.end_date,
     )
 
     if not stats:
@@ -258,10 +312,8 @@ async def get_agent_stats(
 async def get_cost_summary(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-    period: Annotated[str, Query()] = "30d",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
-) -> dict:
+    period_range: Annotated[PeriodRange, Depends(resolve_period("30d"))],
+) -> Response:
     """
     Get cost breakdown summary.
 
@@ -269,17 +321,20 @@ async def get_cost_summary(
     - Total cost for the period
     - Cost breakdown by model
     - Cost breakdown by agent
-    """
-    if start_date and end_date:
-        pass
-    else:
-        start_date, end_date = parse_period(period)
 
-    return await agent_execution_repo.get_cost_summary(
-        db=db,
-        user_id=str(user.id),
-        start_date=start_date,
-        end_date=end_date,
+    Responses are cached per user and range for ANALYTICS_CACHE_TTL_SECONDS.
+    """
+    cache_key = range_cache_key("costs", user.id, period_range)
+
+    return await cached_json_response(
+        cache_key,
+        lambda: agent_execution_repo.get_cost_summary(
+            db=db,
+            user_id=user.id,
+            start_date=period_range.start_date,
+            end_date=period_range.end_date,
+        ),
+        ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
     )
 
 
@@ -287,7 +342,7 @@ async def get_cost_summary(
 async def get_cost_forecast(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-) -> CostForecastDTO:
+) -> Response:
     """
     Get cost forecast based on recent usage patterns.
 
@@ -296,43 +351,56 @@ async def get_cost_forecast(
     - Projected weekly and monthly costs
     - Daily average
     - Cost trend (increasing/decreasing/stable)
+
+    Responses are cached per user for ANALYTICS_CACHE_TTL_SECONDS.
     """
-    return await agent_execution_repo.get_cost_forecast(
-        db=db,
-        user_id=str(user.id),
+    return await cached_json_response(
+        f"analytics:forecast:{user.id}",
+        lambda: agent_execution_repo.get_cost_forecast(
+            db=db,
+            user_id=user.id,
+        ),
+        ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
     )
 
 
 # Budget Alerts
 
 
-@analytics_router.get("/budgets", response_model=List[BudgetAlertDTO])
+def budgets_generation_key(user_id: UUID) -> str:
+    return f"analytics:budgets:{user_id}:generation"
+
+
+@analytics_router.get(
+    "/budgets",
+    response_model=List[BudgetAlertDTO],
+    response_model_exclude_none=True,
+)
 async def list_budget_alerts(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-) -> List[BudgetAlertDTO]:
-    """Get all budget alerts for the current user."""
-    alerts = await budget_alert_repo.get_active_by_user(db, str(user.id))
-    return [
-        BudgetAlertDTO(
-            id=str(a.id),
-            user_id=str(a.user_id),
-            scope=a.scope,
-            scope_id=str(a.scope_id) if a.scope_id else None,
-            threshold_usd=a.threshold_usd,
-            period_days=a.period_days,
-            alert_type=a.alert_type,
-            alert_at_percentage=a.alert_at_percentage,
-            webhook_url=a.webhook_url,
-            email_notification=a.email_notification,
-            is_active=a.is_active,
-            last_alert_sent_at=a.last_alert_sent_at,
-            current_spend_usd=a.current_spend_usd,
-            created_at=a.created_at,
-            updated_at=a.updated_at,
-        )
-        for a in alerts
-    ]
+) -> Response:
+    """Get all budget alerts for the current user.
+
+    Responses are cached per user for ANALYTICS_CACHE_TTL_SECONDS, and
+    replaced whenever one of the user's alerts is created, updated or
+    deleted. Current spend may lag by up to the TTL.
+    """
+    # Read before the alerts are, so a list that misses a change is cached
+    # under a generation that the change has already retired
+    ttl = settings.ANALYTICS_CACHE_TTL_SECONDS
+    current = await generation(budgets_generation_key(user.id)) if ttl > 0 else None
+
+    async def alerts() -> List[BudgetAlertDTO]:
+        rows = await budget_alert_repo.get_active_by_user(db, user.id)
+        return [BudgetAlertDTO.model_validate(a) for a in rows]
+
+    return await cached_json_response(
+        f"analytics:budgets:{user.id}:{current}",
+        alerts,
+        ttl=ttl if current is not None else 0,
+        exclude_none=True,
+    )
 
 
 @analytics_router.post("/budgets", response_model=BudgetAlertDTO)
@@ -357,24 +425,9 @@ async def create_budget_alert(
     )
 
     created = await budget_alert_repo.create(db, obj_in=alert)
+    await next_generation(budgets_generation_key(user.id))
 
-    return BudgetAlertDTO(
-        id=str(created.id),
-        user_id=str(created.user_id),
-        scope=created.scope,
-        scope_id=str(created.scope_id) if created.scope_id else None,
-        threshold_usd=created.threshold_usd,
-        period_days=created.period_days,
-        alert_type=created.alert_type,
-        alert_at_percentage=created.alert_at_percentage,
-        webhook_url=created.webhook_url,
-        email_notification=created.email_notification,
-        is_active=created.is_active,
-        last_alert_sent_at=created.last_alert_sent_at,
-        current_spend_usd=created.current_spend_usd,
-        created_at=created.created_at,
-        updated_at=created.updated_at,
-    )
+    return BudgetAlertDTO.model_validate(created)
 
 
 @analytics_router.patch("/budgets/{alert_id}", response_model=BudgetAlertDTO)
@@ -385,33 +438,18 @@ async def update_budget_alert(
     alert_data: BudgetAlertUpdate,
 ) -> BudgetAlertDTO:
     """Update a budget alert."""
-    alert = await budget_alert_repo.get(db, id_=str(alert_id))
+    alert = await budget_alert_repo.get(db, id_=alert_id)
 
     if not alert:
         raise HTTPException(status_code=404, detail="Budget alert not found")
 
-    if str(alert.user_id) != str(user.id):
+    if alert.user_id != user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
     updated = await budget_alert_repo.update(db, db_obj=alert, obj_in=alert_data)
+    await next_generation(budgets_generation_key(user.id))
 
-    return BudgetAlertDTO(
-        id=str(updated.id),
-        user_id=str(updated.user_id),
-        scope=updated.scope,
-        scope_id=str(updated.scope_id) if updated.scope_id else None,
-        threshold_usd=updated.threshold_usd,
-        period_days=updated.period_days,
-        alert_type=updated.alert_type,
-        alert_at_percentage=updated.alert_at_percentage,
-        webhook_url=updated.webhook_url,
-        email_notification=updated.email_notification,
-        is_active=updated.is_active,
-        last_alert_sent_at=updated.last_alert_sent_at,
-        current_spend_usd=updated.current_spend_usd,
-        created_at=updated.created_at,
-        updated_at=updated.updated_at,
-    )
+    return BudgetAlertDTO.model_validate(updated)
 
 
 @analytics_router.delete("/budgets/{alert_id}")
@@ -421,132 +459,135 @@ async def delete_budget_alert(
     alert_id: UUID,
 ) -> dict:
     """Delete a budget alert."""
-    alert = await budget_alert_repo.get(db, id_=str(alert_id))
-
-    if not alert:
-        raise HTTPException(status_code=404, detail="Budget alert not found")
-
-    if str(alert.user_id) != str(user.id):
+    if not await budget_alert_repo.delete_for_user(db, alert_id=alert_id, user_id=user.id):
+        # Only a failed delete needs to tell a missing alert from someone else's
+        if not await budget_alert_repo.get(db, id_=alert_id):
+            raise HTTPException(status_code=404, detail="Budget alert not found")
         raise HTTPException(status_code=403, detail="Access denied")
 
-    await budget_alert_repo.delete(db, id_=str(alert_id))
+    await next_generation(budgets_generation_key(user.id))
     return {"status": "deleted", "id": str(alert_id)}
 
 
 # Export
 
+EXPORT_FIELDS = [
+    "id",
+    "request_id",
+    "session_id",
+    "agent_name",
+    "agent_type",
+    "model_name",
+    "status",
+    "execution_time_ms",
+    "total_tokens",
+    "cost_usd",
+    "started_at",
+    "completed_at",
+    "query_preview",
+]
+# Rows written between flushes of a streamed export; matches the
+# server-side cursor's batch size
+EXPORT_CHUNK_ROWS = 500
+# Compact separators trim about 5% off JSON exports; one shared
+# encoder because json.dumps only caches the one with default arguments
+export_json = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def _export_record(item) -> dict:
+    return {
+        "id": item.id,
+        "request_id": item.request_id,
+        "session_id": item.session_id,
+        "agent_name": item.agent_name,
+        "agent_type": item.agent_type.value if item.agent_type else None,
+        "model_name": item.model_name,
+        "status": item.status.value if item.status else None,
+        "execution_time_ms": item.execution_time_ms,
+        "total_tokens": item.total_tokens,
+        "cost_usd": str(item.cost_usd),
+        "started_at": item.started_at.isoformat() if item.started_at else None,
+        "completed_at": item.completed_at.isoformat() if item.completed_at else None,
+        "query_preview": item.query_preview,
+    }
+
 
 @analytics_router.get("/export")
 async def export_analytics_data(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-    format: Annotated[str, Query(description="Export format: json or csv")] = "json",
-    period: Annotated[str, Query()] = "7d",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
+    period_range: Annotated[PeriodRange, Depends(resolve_period("7d"))],
+    format: Annotated[ExportFileFormat, Query(description="Export format: json or csv")] = "json",
     include_traces: Annotated[bool, Query()] = False,
 ):
     """
     Export analytics data in JSON or CSV format.
-    """
-    if start_date and end_date:
-        pass
-    else:
-        start_date, end_date = parse_period(period)
 
-    # Get executions
-    paginated = await agent_execution_repo.list_paginated(
-        db=db,
-        user_id=str(user.id),
-        start_date=start_date,
-        end_date=end_date,
-        page=1,
-        page_size=10000,  # Export all
-    )
+    The file is streamed: rows are written out as they come off the
+    database cursor, so neither side holds the whole export in memory.
+    """
+    async def records() -> AsyncIterator[dict]:
+        # The request's session is closed when this endpoint returns, before
+        # the body is sent, so the stream reads on a session of its own
+        async with AsyncSession(db.bind) as stream_db:
+            rows = agent_execution_repo.stream_export_rows(
+                db=stream_db,
+                user_id=user.id,
+                start_date=period_range.start_date,
+                end_date=period_range.end_date,
+                batch_size=EXPORT_CHUNK_ROWS,
+            )
+            async for item in rows:
+                yield _export_record(item)
+
+    filename = f"analytics_export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
 
     if format == "csv":
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=[
-                "id",
-                "request_id",
-                "session_id",
-                "agent_name",
-                "agent_type",
-                "model_name",
-                "status",
-                "execution_time_ms",
-                "total_tokens",
-                "cost_usd",
-                "started_at",
-                "completed_at",
-                "query_preview",
-            ],
-        )
-        writer.writeheader()
-        for item in paginated.items:
-            writer.writerow({
-                "id": item.id,
-                "request_id": item.request_id,
-                "session_id": item.session_id,
-                "agent_name": item.agent_name,
-                "agent_type": item.agent_type,
-                "model_name": item.model_name,
-                "status": item.status.value if item.status else "",
-                "execution_time_ms": item.execution_time_ms,
-                "total_tokens": item.total_tokens,
-                "cost_usd": str(item.cost_usd),
-                "started_at": item.started_at.isoformat() if item.started_at else "",
-                "completed_at": item.completed_at.isoformat() if item.completed_at else "",
-                "query_preview": item.query_preview,
-            })
-
-        output.seek(0)
+
+        async def csv_chunks() -> AsyncIterator[str]:
+            output = io.StringIO()
+            # A plain writer fed by itemgetter skips DictWriter's per-row
+            # key check and list building
+            writer = csv.writer(output)
+            writer.writerow(EXPORT_FIELDS)
+            row_values = itemgetter(*EXPORT_FIELDS)
+            written = 0
+            async for record in records():
+                writer.writerow(row_values(record))
+                written += 1
+                if written % EXPORT_CHUNK_ROWS == 0:
+                    yield output.getvalue()
+                    output.seek(0)
+                    output.truncate(0)
+            yield output.getvalue()
+
         return StreamingResponse(
-            iter([output.getvalue()]),
+            csv_chunks(),
             media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=analytics_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-            },
+            headers={"Content-Disposition": f"attachment; filename={filename}.csv"},
         )
     else:
-        # JSON format
-        data = {
-            "export_date": datetime.utcnow().isoformat(),
-            "period": {"start": start_date.isoformat(), "end": end_date.isoformat()},
-            "total_records": paginated.total,
-            "executions": [
+        # JSON format; total_records is only known once every row is out,
+        # so it comes after the executions
+        async def json_chunks() -> AsyncIterator[str]:
+            export_date = export_json.encode(datetime.now(timezone.utc).isoformat())
+            period = export_json.encode(
                 {
-                    "id": item.id,
-                    "request_id": item.request_id,
-                    "session_id": item.session_id,
-                    "agent_name": item.agent_name,
-                    "agent_type": item.agent_type,
-                    "model_name": item.model_name,
-                    "status": item.status.value if item.status else None,
-                    "execution_time_ms": item.execution_time_ms,
-                    "total_tokens": item.total_tokens,
-                    "cost_usd": str(item.cost_usd),
-                    "started_at": item.started_at.isoformat() if item.started_at else None,
-                    "completed_at": item.completed_at.isoformat() if item.completed_at else None,
-                    "query_preview": item.query_preview,
+                    "start": period_range.start_date.isoformat(),
+                    "end": period_range.end_date.isoformat(),
                 }
-                for item in paginated.items
-            ],
-        }
-
-        output = io.StringIO()
-        json.dump(data, output, indent=2)
-        output.seek(0)
+            )
+            yield f'{{"export_date":{export_date},"period":{period},"executions":['
+            total = 0
+            async for record in records():
+                yield ("," if total else "") + export_json.encode(record)
+                total += 1
+            yield f'],"total_records":{total}}}'
 
         return StreamingResponse(
-            iter([output.getvalue()]),
+            json_chunks(),
             media_type="application/json",
-            headers={
-                "Content-Disposition": f"attachment; filename=analytics_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-            },
+            headers={"Content-Disposition": f"attachment; filename={filename}.json"},
         )
 
 
@@ -557,67 +598,29 @@ async def export_analytics_data(
 async def compare_models(
     db: AsyncDBSession,
     user: CurrentUserDependency,
-    period: Annotated[str, Query()] = "7d",
-    start_date: Annotated[Optional[datetime], Query()] = None,
-    end_date: Annotated[Optional[datetime], Query()] = None,
-) -> List[dict]:
+    period_range: Annotated[PeriodRange, Depends(resolve_period("7d"))],
+) -> Response:
     """
     Compare performance across different models.
 
     Returns metrics for each model:
     - Execution count
     - Success rate
-    - Average execution time
+    - Average and p50/p95/p99 execution time
     - Average tokens
     - Total cost
+
+    Responses are cached per user and range for ANALYTICS_CACHE_TTL_SECONDS.
     """
-    if start_date and end_date:
-        pass
-    else:
-        start_date, end_date = parse_period(period)
-
-    from sqlalchemy import and_, case, desc, func, select
-    from src.models import AgentExecution
-
-    filters = [
-        AgentExecution.user_id == str(user.id),
-        AgentExecution.started_at >= start_date,
-        AgentExecution.started_at <= end_date,
-        AgentExecution.model_name.isnot(None),
-    ]
-
-    query = (
-        select(
-            AgentExecution.model_name,
-            func.count().label("execution_count"),
-            func.sum(case((AgentExecution.status == ExecutionStatus.success, 1), else_=0)).label(
-                "success_count"
-            ),
-            func.avg(AgentExecution.execution_time_ms).label("avg_execution_time_ms"),
-            func.avg(AgentExecution.total_tokens).label("avg_tokens"),
-            func.sum(AgentExecution.total_tokens).label("total_tokens"),
-            func.sum(AgentExecution.cost_usd).label("total_cost"),
-        )
-        .where(and_(*filters))
-        .group_by(AgentExecution.model_name)
-        .order_by(desc("execution_count"))
+    cache_key = range_cache_key("models", user.id, period_range)
+
+    return await cached_json_response(
+        cache_key,
+        lambda: agent_execution_repo.get_model_comparison(
+            db=db,
+            user_id=user.id,
+            start_date=period_range.start_date,
+            end_date=period_range.end_date,
+        ),
+        ttl=settings.ANALYTICS_CACHE_TTL_SECONDS,
     )
-
-    result = await db.execute(query)
-    models = result.fetchall()
-
-    return [
-        {
-            "model_name": row.model_name,
-            "execution_count": row.execution_count,
-            "success_count": row.success_count or 0,
-            "success_rate": (row.success_count or 0) / row.execution_count * 100
-            if row.execution_count > 0
-            else 0,
-            "avg_execution_time_ms": float(row.avg_execution_time_ms or 0),
-            "avg_tokens": float(row.avg_tokens or 0),
-            "total_tokens": row.total_tokens or 0,
-            "total_cost_usd": str(row.total_cost or 0),
-        }
-        for row in models
-    ]
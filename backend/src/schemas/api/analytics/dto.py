@@ -1,22 +1,26 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, Field
 
 from src.utils.enums import (
+    AgentType,
     BudgetAlertType,
     BudgetScope,
     ExecutionStatus,
     ExecutionTraceStepType,
 )
 
+# ORM ids are UUIDs; the API returns them as strings
+UUIDStr = Annotated[str, BeforeValidator(str)]
+
 
 class TokenUsageDTO(BaseModel):
     """Token usage details for a single component."""
 
-    id: str
-    execution_id: str
+    id: UUIDStr
+    execution_id: UUIDStr
     component: str
     step_number: Optional[int] = None
     input_tokens: int = 0
@@ -32,12 +36,12 @@ class TokenUsageDTO(BaseModel):
 class ExecutionTraceDTO(BaseModel):
     """Step-by-step trace entry."""
 
-    id: str
-    execution_id: str
+    id: UUIDStr
+    execution_id: UUIDStr
     step_number: int
     step_type: ExecutionTraceStepType
     content: Optional[str] = None
-    invoked_agent_id: Optional[str] = None
+    invoked_agent_id: Optional[UUIDStr] = None
     invoked_agent_name: Optional[str] = None
     timestamp: datetime
     duration_ms: int = 0
@@ -51,14 +55,14 @@ class ExecutionTraceDTO(BaseModel):
 class AgentExecutionDTO(BaseModel):
     """Detailed execution information."""
 
-    id: str
-    request_id: str
-    session_id: str
-    agent_id: Optional[str] = None
-    agent_type: Optional[str] = None
+    id: UUIDStr
+    request_id: UUIDStr
+    session_id: UUIDStr
+    agent_id: Optional[UUIDStr] = None
+    agent_type: Optional[AgentType] = None
     agent_name: Optional[str] = None
-    user_id: Optional[str] = None
-    model_config_id: Optional[str] = None
+    user_id: Optional[UUIDStr] = None
+    model_config_id: Optional[UUIDStr] = None
     model_name: Optional[str] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
@@ -71,7 +75,7 @@ class AgentExecutionDTO(BaseModel):
     execution_time_ms: int = 0
     llm_time_ms: Optional[int] = 0
     cost_usd: Decimal = Decimal("0.000000")
-    parent_execution_id: Optional[str] = None
+    parent_execution_id: Optional[UUIDStr] = None
     query_preview: Optional[str] = None
     created_at: datetime
     updated_at: datetime
@@ -91,7 +95,7 @@ class AgentExecutionSummaryDTO(BaseModel):
     request_id: str
     session_id: str
     agent_name: Optional[str] = None
-    agent_type: Optional[str] = None
+    agent_type: Optional[AgentType] = None
     model_name: Optional[str] = None
     status: ExecutionStatus
     execution_time_ms: int = 0
@@ -108,10 +112,10 @@ class AgentExecutionSummaryDTO(BaseModel):
 class BudgetAlertDTO(BaseModel):
     """Budget alert configuration."""
 
-    id: str
-    user_id: str
+    id: UUIDStr
+    user_id: UUIDStr
     scope: BudgetScope
-    scope_id: Optional[str] = None
+    scope_id: Optional[UUIDStr] = None
     threshold_usd: Decimal
     period_days: int = 30
     alert_type: BudgetAlertType
@@ -133,7 +137,7 @@ class TopAgentDTO(BaseModel):
 
     agent_id: Optional[str] = None
     agent_name: str
-    agent_type: Optional[str] = None
+    agent_type: Optional[AgentType] = None
     execution_count: int = 0
     success_count: int = 0
     failure_count: int = 0
@@ -228,9 +232,9 @@ class CostForecastDTO(BaseModel):
 class AgentStatsDTO(BaseModel):
     """Statistics for a specific agent."""
 
-    agent_id: Optional[str] = None
+    agent_id: Optional[UUIDStr] = None
     agent_name: str
-    agent_type: Optional[str] = None
+    agent_type: Optional[AgentType] = None
 
     # Execution metrics
     total_executions: int = 0
@@ -270,7 +274,19 @@ class PaginatedExecutionsDTO(BaseModel):
     """Paginated list of executions."""
 
     items: List[AgentExecutionSummaryDTO]
-    total: int
+    # Not counted, and left out, on pages fetched by cursor
+    total: Optional[int] = None
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    # Pass back as `cursor` for the next page; set on full pages sorted by started_at
+    next_cursor: Optional[str] = None
+
+
+class DashboardDTO(BaseModel):
+    """Everything the analytics dashboard loads up front, for one period."""
+
+    overview: AnalyticsOverviewDTO
+    cost_summary: dict
+    cost_forecast: CostForecastDTO
+    model_comparison: List[dict]
@@ -1,17 +1,28 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Annotated, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
 from src.utils.enums import (
+    AgentType,
     BudgetAlertType,
     BudgetScope,
     ExecutionStatus,
     ExecutionTraceStepType,
 )
 
+# Bounds shared by the create and update schemas. Step numbers are stored as
+# SMALLINT
+StepNumber = Annotated[int, Field(ge=0, le=32767)]
+PeriodDays = Annotated[int, Field(ge=1, le=365)]
+Percentage = Annotated[int, Field(ge=1, le=100)]
+
+Period = Literal["24h", "7d", "30d", "90d"]
+SortOrder = Literal["asc", "desc"]
+ExportFileFormat = Literal["json", "csv"]
+
 
 class AgentExecutionCreate(BaseModel):
     """Create a new agent execution record."""
@@ -19,7 +30,7 @@ class AgentExecutionCreate(BaseModel):
     request_id: UUID
     session_id: UUID
     agent_id: Optional[UUID] = None
-    agent_type: Optional[str] = None
+    agent_type: Optional[AgentType] = None
     agent_name: Optional[str] = None
     user_id: Optional[UUID] = None
     model_config_id: Optional[UUID] = None
@@ -49,18 +60,26 @@ class TokenUsageCreate(BaseModel):
 
     execution_id: UUID
     component: str
-    step_number: Optional[int] = None
+    step_number: Optional[StepNumber] = None
     input_tokens: int = 0
     output_tokens: int = 0
     model: Optional[str] = None
     cost_usd: Decimal = Decimal("0.000000")
 
 
+class ModelPricingCreate(BaseModel):
+    """Create or replace a model's token prices (USD per 1K tokens)."""
+
+    model_name: str
+    input_cost_per_1k: Decimal
+    output_cost_per_1k: Decimal
+
+
 class ExecutionTraceCreate(BaseModel):
     """Create an execution trace step."""
 
     execution_id: UUID
-    step_number: int
+    step_number: StepNumber
     step_type: ExecutionTraceStepType
     content: Optional[str] = None
     invoked_agent_id: Optional[UUID] = None
@@ -76,9 +95,9 @@ class BudgetAlertCreate(BaseModel):
     scope: BudgetScope = BudgetScope.user
     scope_id: Optional[UUID] = None
     threshold_usd: Decimal
-    period_days: int = 30
+    period_days: PeriodDays = 30
     alert_type: BudgetAlertType = BudgetAlertType.warning
-    alert_at_percentage: int = Field(default=80, ge=1, le=100)
+    alert_at_percentage: Percentage = 80
     webhook_url: Optional[str] = None
     email_notification: bool = True
 
@@ -87,9 +106,9 @@ class BudgetAlertUpdate(BaseModel):
     """Update a budget alert."""
 
     threshold_usd: Optional[Decimal] = None
-    period_days: Optional[int] = None
+    period_days: Optional[PeriodDays] = None
     alert_type: Optional[BudgetAlertType] = None
-    alert_at_percentage: Optional[int] = Field(default=None, ge=1, le=100)
+    alert_at_percentage: Optional[Percentage] = None
     webhook_url: Optional[str] = None
     email_notification: Optional[bool] = None
     is_active: Optional[bool] = None
@@ -101,11 +120,11 @@ class AnalyticsQueryParams(BaseModel):
     # Time range
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
-    period: Optional[str] = "24h"  # 24h, 7d, 30d, custom
+    period: Literal[Period, "custom"] = "24h"
 
     # Filters
     agent_id: Optional[UUID] = None
-    agent_type: Optional[str] = None
+    agent_type: Optional[AgentType] = None
     model_name: Optional[str] = None
     status: Optional[ExecutionStatus] = None
 
@@ -115,12 +134,12 @@ class AnalyticsQueryParams(BaseModel):
 
     # Sorting
     sort_by: Optional[str] = "started_at"
-    sort_order: Optional[str] = "desc"  # asc, desc
+    sort_order: SortOrder = "desc"
 
 
 class ExportFormat(BaseModel):
     """Export format specification."""
 
-    format: str = "json"  # json, csv
+    format: ExportFileFormat = "json"
     include_traces: bool = False
     include_token_details: bool = False
@@ -3,11 +3,13 @@ from typing import Optional, Union
 from uuid import UUID
 from pydantic import BaseModel
 
+from src.utils.enums import LogLevel
+
 
 class LogBase(BaseModel):
     session_id: Union[str, UUID]
     request_id: Union[str, UUID]
-    log_level: str
+    log_level: LogLevel
     message: str
 
 
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Response
+from pydantic_core import to_json
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.settings import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Redis:
+    """Process-wide Redis client; connections are opened on first use."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.REDIS_CACHE_URI,
+            socket_connect_timeout=1,
+            socket_timeout=1,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def encode_json(value: Any, exclude_none: bool = False) -> bytes:
+    """Encode a response body once, straight to JSON bytes.
+
+    Uses pydantic's serializer, which FastAPI also applies to return values,
+    so models, Decimals and datetimes come out the same either way.
+    """
+    return to_json(value, exclude_none=exclude_none)
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+async def _cached_json(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    exclude_none: bool,
+) -> bytes:
+    if ttl <= 0:
+        return encode_json(await compute(), exclude_none)
+
+    redis = get_redis()
+    try:
+        cached = await redis.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return encode_json(await compute(), exclude_none)
+    if cached is not None:
+        return cached
+
+    body = encode_json(await compute(), exclude_none)
+    try:
+        await redis.set(key, body, ex=ttl)
+    except RedisError as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+    return body
+
+
+# Bodies being produced right now in this process, by key
+_in_flight: dict[str, asyncio.Future[bytes]] = {}
+
+
+async def _single_flight(key: str, produce: Callable[[], Awaitable[bytes]]) -> bytes:
+    """Run `produce` once for concurrent callers with the same `key`.
+
+    Callers that arrive while it runs wait for its result instead of
+    starting their own. If it fails or its caller goes away, the next
+    waiter takes over.
+    """
+    while (future := _in_flight.get(key)) is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        body = await produce()
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        _in_flight.pop(key, None)
+    future.set_result(body)
+    return body
+
+
+async def cached_json_response(
+    key: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int,
+    exclude_none: bool = False,
+) -> Response:
+    """Return the JSON cached under `key`, or compute it and cache it for `ttl` seconds.
+
+    A hit is sent back exactly as stored, without decoding or re-encoding it.
+    Concurrent requests for the same key in this process share one cache
+    lookup and, on a miss, one computation. The cache is an optimization
+    only: with `ttl` of 0, or when Redis cannot be reached, the value is
+    computed on every call.
+    """
+    return json_response(
+        await _single_flight(key, lambda: _cached_json(key, compute, ttl, exclude_none))
+    )
+
+
+async def generation(key: str) -> Optional[int]:
+    """Current generation counter stored under `key`, or None if Redis cannot be reached.
+
+    Entries whose cache key includes the generation are invalidated by
+    moving to the next one instead of deleting them. A value computed from
+    data read before the change is then stored under the old key, where no
+    later request looks, rather than over the fresh one.
+    """
+    try:
+        value = await get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+    return int(value or 0)
+
+
+async def next_generation(key: str) -> None:
+    """Advance the generation counter under `key`, after the data behind it changed."""
+    try:
+        await get_redis().incr(key)
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed for {key}: {e}")
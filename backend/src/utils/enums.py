@@ -1,42 +1,50 @@
 from enum import Enum
 
 
-class AgentPlanType(Enum):
+class AgentPlanType(str, Enum):
     agent = "agent"
     flow = "flow"
 
 
-class AgentType(Enum):
+class AgentType(str, Enum):
     genai = "genai"
     flow = "flow"
     mcp = "mcp"
     a2a = "a2a"
 
 
-class FileValidationOutputChoice(Enum):
+class FileValidationOutputChoice(str, Enum):
     file_id = "file_id"
     dto = "dto"
 
 
-class SenderType(Enum):
+class SenderType(str, Enum):
     user = "user"
     master_agent = "master_agent"
 
 
-class ActiveAgentTypeFilter(Enum):
+class LogLevel(str, Enum):
+    debug = "debug"
+    info = "info"
+    warning = "warning"
+    error = "error"
+    critical = "critical"
+
+
+class ActiveAgentTypeFilter(str, Enum):
     genai = "genai"
     mcp = "mcp"
     a2a = "a2a"
     all = "all"
 
 
-class AgentIdType(Enum):
+class AgentIdType(str, Enum):
     agent_id = "agent_id"
     mcp_tool_id = "mcp_tool_id"
     a2a_card_id = "a2a_card_id"
 
 
-class ExecutionStatus(Enum):
+class ExecutionStatus(str, Enum):
     pending = "pending"
     running = "running"
     success = "success"
@@ -45,7 +53,7 @@ class ExecutionStatus(Enum):
     cancelled = "cancelled"
 
 
-class ExecutionTraceStepType(Enum):
+class ExecutionTraceStepType(str, Enum):
     thought = "thought"
     action = "action"
     observation = "observation"
@@ -54,13 +62,20 @@ class ExecutionTraceStepType(Enum):
     final_answer = "final_answer"
 
 
-class BudgetAlertType(Enum):
+class BudgetAlertType(str, Enum):
     warning = "warning"
     hard_stop = "hard_stop"
 
 
-class BudgetScope(Enum):
+class BudgetScope(str, Enum):
     user = "user"
     agent = "agent"
     flow = "flow"
     global_ = "global"
+
+
+class SnapshotPeriodType(str, Enum):
+    hourly = "hourly"
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
@@ -1,2 +1,6 @@
 class InvalidToolNameException(BaseException):
     pass
+
+
+class InvalidCursor(ValueError):
+    """A pagination cursor that is malformed or cannot be used with the request."""
@@ -11,16 +11,23 @@ This module contains tests for:
 - Budget alerts CRUD
 - Model comparison endpoint
 - Export endpoint
+- Query parameter validation
 """
 
+import asyncio
 import pytest
-from datetime import datetime, timedelta
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from uuid import uuid4
 
 import aiohttp
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
 
 ANALYTICS_BASE = "/api/analytics"
 OVERVIEW_ENDPOINT = f"{ANALYTICS_BASE}/overview"
+DASHBOARD_ENDPOINT = f"{ANALYTICS_BASE}/dashboard"
 EXECUTIONS_ENDPOINT = f"{ANALYTICS_BASE}/executions"
 EXECUTION_DETAIL_ENDPOINT = f"{ANALYTICS_BASE}/executions/{{execution_id}}"
 AGENT_STATS_ENDPOINT = f"{ANALYTICS_BASE}/agents/{{agent_id}}/stats"
@@ -35,26 +42,42 @@ BASE_URL = "http://localhost:8000"
 
 
 class HttpClient:
-    """Simple HTTP client that returns JSON directly."""
+    """Simple HTTP client that returns JSON directly.
+
+    Every request goes through one pooled session, created on first use.
+    """
 
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url.rstrip("/")
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
     async def _request(self, method: str, path: str, **kwargs):
         url = f"{self.base_url}/{path.lstrip('/')}"
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, **kwargs) as response:
-                if response.status >= 400:
-                    raise aiohttp.ClientResponseError(
-                        response.request_info,
-                        response.history,
-                        status=response.status,
-                        message=await response.text(),
-                    )
-                content_type = response.headers.get("Content-Type", "")
-                if "application/json" in content_type:
-                    return await response.json()
-                return await response.text()
+        session = await self._ensure_session()
+        async with session.request(method, url, **kwargs) as response:
+            if response.status >= 400:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=await response.text(),
+                )
+            content_type = response.headers.get("Content-Type", "")
+            if "application/json" in content_type:
+                return await response.json()
+            return await response.text()
 
     async def get(self, path: str, **kwargs):
         return await self._request("GET", path, **kwargs)
@@ -71,11 +94,21 @@ class HttpClient:
 
 http_client = HttpClient()
 
+# The client's session is bound to the event loop it was created on, so the
+# whole module runs on one loop
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module", autouse=True)
+async def shared_http_client():
+    """Provide the module's HTTP client and close its session after the last test."""
+    yield http_client
+    await http_client.close()
+
 
 class TestAnalyticsOverview:
     """Tests for the analytics overview endpoint."""
 
-    @pytest.mark.asyncio
     async def test_get_overview_default_period(self, user_jwt_token: str):
         """Test getting analytics overview with default 24h period."""
         response = await http_client.get(
@@ -95,24 +128,24 @@ class TestAnalyticsOverview:
         assert isinstance(response["total_executions"], int)
         assert isinstance(response["top_agents"], list)
 
-    @pytest.mark.asyncio
-    @pytest.mark.parametrize(
-        "period",
-        ["24h", "7d", "30d", "90d"],
-        ids=["24h period", "7d period", "30d period", "90d period"],
-    )
-    async def test_get_overview_different_periods(self, user_jwt_token: str, period: str):
+    async def test_get_overview_different_periods(self, user_jwt_token: str):
         """Test getting analytics overview with different time periods."""
-        response = await http_client.get(
-            path=OVERVIEW_ENDPOINT,
-            params={"period": period},
-            headers={"Authorization": f"Bearer {user_jwt_token}"},
+        periods = ["24h", "7d", "30d", "90d"]
+        responses = await asyncio.gather(
+            *(
+                http_client.get(
+                    path=OVERVIEW_ENDPOINT,
+                    params={"period": period},
+                    headers={"Authorization": f"Bearer {user_jwt_token}"},
+                )
+                for period in periods
+            )
         )
 
-        assert "total_executions" in response
-        assert response["total_executions"] >= 0
+        for period, response in zip(periods, responses):
+            assert "total_executions" in response, period
+            assert response["total_executions"] >= 0, period
 
-    @pytest.mark.asyncio
     async def test_get_overview_custom_date_range(self, user_jwt_token: str):
         """Test getting analytics overview with custom date range."""
         end_date = datetime.utcnow()
@@ -129,7 +162,6 @@ class TestAnalyticsOverview:
 
         assert "total_executions" in response
 
-    @pytest.mark.asyncio
     async def test_get_overview_unauthorized(self):
         """Test that unauthorized requests are rejected."""
         try:
@@ -139,10 +171,68 @@ class TestAnalyticsOverview:
             pass  # Expected to fail without auth
 
 
+class TestAnalyticsDashboard:
+    """Tests for the combined dashboard endpoint."""
+
+    async def test_get_dashboard(self, user_jwt_token: str):
+        """Test that the dashboard returns every panel, consistent with /overview."""
+        end_date = datetime.utcnow()
+        start_date = end_date - timedelta(days=7)
+        params = {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+        }
+
+        dashboard, overview = await asyncio.gather(
+            http_client.get(
+                path=DASHBOARD_ENDPOINT,
+                params=params,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            ),
+            http_client.get(
+                path=OVERVIEW_ENDPOINT,
+                params=params,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            ),
+        )
+
+        assert set(dashboard) == {"overview", "cost_summary", "cost_forecast", "model_comparison"}
+        assert isinstance(dashboard["model_comparison"], list)
+        assert dashboard["overview"]["total_executions"] == overview["total_executions"]
+
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def seeded_executions(async_db_engine: AsyncEngine, user_jwt_token: str, get_user):
+    """Three executions of the test user a minute apart, newest first; removed afterwards."""
+    user_id = await get_user(user_jwt_token)
+    now = datetime.now(timezone.utc)
+    execution_ids = [uuid4() for _ in range(3)]
+    async with async_db_engine.begin() as conn:
+        for minutes, execution_id in enumerate(execution_ids, start=1):
+            await conn.execute(
+                text(
+                    "INSERT INTO agentexecutions "
+                    "(id, request_id, session_id, user_id, started_at, status) "
+                    "VALUES (:id, :id, :id, :user_id, :started_at, 'success')"
+                ),
+                {
+                    "id": execution_id,
+                    "user_id": user_id,
+                    "started_at": now - timedelta(minutes=minutes),
+                },
+            )
+
+    yield [str(execution_id) for execution_id in execution_ids]
+
+    async with async_db_engine.begin() as conn:
+        await conn.execute(
+            text("DELETE FROM agentexecutions WHERE id = ANY(:ids)"), {"ids": execution_ids}
+        )
+
+
 class TestExecutionsList:
     """Tests for the executions list endpoint."""
 
-    @pytest.mark.asyncio
     async def test_list_executions_default(self, user_jwt_token: str):
         """Test listing executions with default parameters."""
         response = await http_client.get(
@@ -157,7 +247,6 @@ class TestExecutionsList:
         assert "total_pages" in response
         assert isinstance(response["items"], list)
 
-    @pytest.mark.asyncio
     @pytest.mark.parametrize(
         "page,page_size",
         [(1, 10), (1, 20), (2, 10)],
@@ -177,7 +266,6 @@ class TestExecutionsList:
         assert response["page_size"] == page_size
         assert len(response["items"]) <= page_size
 
-    @pytest.mark.asyncio
     async def test_list_executions_filter_by_status(self, user_jwt_token: str):
         """Test filtering executions by status."""
         response = await http_client.get(
@@ -190,7 +278,6 @@ class TestExecutionsList:
         for item in response["items"]:
             assert item["status"] == "success"
 
-    @pytest.mark.asyncio
     async def test_list_executions_sort_by_time(self, user_jwt_token: str):
         """Test sorting executions by time."""
         response = await http_client.get(
@@ -201,11 +288,48 @@ class TestExecutionsList:
 
         assert "items" in response
 
+    async def test_list_executions_cursor_pages(
+        self, user_jwt_token: str, seeded_executions: list[str]
+    ):
+        """Test walking the executions list by cursor."""
+        first = await http_client.get(
+            path=EXECUTIONS_ENDPOINT,
+            params={"page_size": 2},
+            headers={"Authorization": f"Bearer {user_jwt_token}"},
+        )
+        assert first["next_cursor"]
+        assert first["total"] == len(seeded_executions)
+
+        second = await http_client.get(
+            path=EXECUTIONS_ENDPOINT,
+            params={"page_size": 2, "cursor": first["next_cursor"]},
+            headers={"Authorization": f"Bearer {user_jwt_token}"},
+        )
+        # Cursor pages are not counted
+        assert "total" not in second
+        assert "next_cursor" not in second
+
+        items = first["items"] + second["items"]
+        ids = [item["id"] for item in items]
+        assert len(set(ids)) == len(ids)
+        assert ids == seeded_executions
+        started = [datetime.fromisoformat(item["started_at"]) for item in items]
+        assert started == sorted(started, reverse=True)
+
+    async def test_list_executions_invalid_cursor(self, user_jwt_token: str):
+        """Test that a malformed cursor is rejected."""
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await http_client.get(
+                path=EXECUTIONS_ENDPOINT,
+                params={"cursor": "garbage"},
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            )
+        assert exc_info.value.status == 400
+
 
 class TestExecutionDetails:
     """Tests for the execution details endpoint."""
 
-    @pytest.mark.asyncio
     async def test_get_execution_not_found(self, user_jwt_token: str):
         """Test getting a non-existent execution."""
         fake_id = str(uuid4())
@@ -218,7 +342,6 @@ class TestExecutionDetails:
         except Exception:
             pass  # Expected
 
-    @pytest.mark.asyncio
     async def test_get_execution_invalid_uuid(self, user_jwt_token: str):
         """Test getting execution with invalid UUID."""
         try:
@@ -234,7 +357,6 @@ class TestExecutionDetails:
 class TestAgentStats:
     """Tests for the agent stats endpoint."""
 
-    @pytest.mark.asyncio
     async def test_get_agent_stats_not_found(self, user_jwt_token: str):
         """Test getting stats for non-existent agent."""
         fake_id = str(uuid4())
@@ -251,7 +373,6 @@ class TestAgentStats:
 class TestCostEndpoints:
     """Tests for cost-related endpoints."""
 
-    @pytest.mark.asyncio
     async def test_get_cost_summary(self, user_jwt_token: str):
         """Test getting cost summary."""
         response = await http_client.get(
@@ -264,7 +385,6 @@ class TestCostEndpoints:
         assert "by_model" in response
         assert "by_agent" in response
 
-    @pytest.mark.asyncio
     async def test_get_cost_forecast(self, user_jwt_token: str):
         """Test getting cost forecast."""
         response = await http_client.get(
@@ -281,7 +401,6 @@ class TestCostEndpoints:
 class TestBudgetAlerts:
     """Tests for budget alert CRUD operations."""
 
-    @pytest.mark.asyncio
     async def test_list_budget_alerts_empty(self, user_jwt_token: str):
         """Test listing budget alerts when none exist."""
         response = await http_client.get(
@@ -291,7 +410,6 @@ class TestBudgetAlerts:
 
         assert isinstance(response, list)
 
-    @pytest.mark.asyncio
     async def test_create_budget_alert(self, user_jwt_token: str):
         """Test creating a budget alert."""
         alert_data = {
@@ -313,7 +431,20 @@ class TestBudgetAlerts:
         assert response["period_days"] == 30
         assert response["alert_at_percentage"] == 80
 
-    @pytest.mark.asyncio
+    async def test_list_budget_alerts_after_create(self, user_jwt_token: str):
+        """Test that a cached alert list picks up an alert created after it."""
+        headers = {"Authorization": f"Bearer {user_jwt_token}"}
+        await http_client.get(path=BUDGETS_ENDPOINT, headers=headers)
+
+        created = await http_client.post(
+            path=BUDGETS_ENDPOINT,
+            json={"threshold_usd": 10.00},
+            headers=headers,
+        )
+        alerts = await http_client.get(path=BUDGETS_ENDPOINT, headers=headers)
+
+        assert created["id"] in [alert["id"] for alert in alerts]
+
     async def test_create_budget_alert_invalid_percentage(self, user_jwt_token: str):
         """Test creating a budget alert with invalid percentage."""
         alert_data = {
@@ -331,7 +462,6 @@ class TestBudgetAlerts:
         except Exception:
             pass  # Expected
 
-    @pytest.mark.asyncio
     async def test_update_budget_alert(self, user_jwt_token: str):
         """Test updating a budget alert."""
         # First create an alert
@@ -353,7 +483,6 @@ class TestBudgetAlerts:
         assert float(updated["threshold_usd"]) == 75.00 or updated["threshold_usd"] == "75.00"
         assert updated["is_active"] is False
 
-    @pytest.mark.asyncio
     async def test_delete_budget_alert(self, user_jwt_token: str):
         """Test deleting a budget alert."""
         # First create an alert
@@ -372,7 +501,6 @@ class TestBudgetAlerts:
 
         assert delete_data["status"] == "deleted"
 
-    @pytest.mark.asyncio
     async def test_delete_budget_alert_not_found(self, user_jwt_token: str):
         """Test deleting a non-existent budget alert."""
         fake_id = str(uuid4())
@@ -385,11 +513,31 @@ class TestBudgetAlerts:
         except Exception:
             pass  # Expected
 
+    async def test_delete_budget_alert_other_user(
+        self, user_jwt_token: str, other_user_jwt_token: str
+    ):
+        """Test that a user cannot delete another user's budget alert."""
+        owner_headers = {"Authorization": f"Bearer {user_jwt_token}"}
+        created = await http_client.post(
+            path=BUDGETS_ENDPOINT,
+            json={"threshold_usd": 15.00},
+            headers=owner_headers,
+        )
+
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await http_client.delete(
+                path=BUDGET_DETAIL_ENDPOINT.format(alert_id=created["id"]),
+                headers={"Authorization": f"Bearer {other_user_jwt_token}"},
+            )
+        assert exc_info.value.status == 403
+
+        alerts = await http_client.get(path=BUDGETS_ENDPOINT, headers=owner_headers)
+        assert created["id"] in [alert["id"] for alert in alerts]
+
 
 class TestModelComparison:
     """Tests for model comparison endpoint."""
 
-    @pytest.mark.asyncio
     async def test_compare_models(self, user_jwt_token: str):
         """Test getting model comparison data."""
         response = await http_client.get(
@@ -409,7 +557,6 @@ class TestModelComparison:
 class TestExport:
     """Tests for the export endpoint."""
 
-    @pytest.mark.asyncio
     async def test_export_json(self, user_jwt_token: str):
         """Test exporting analytics data as JSON."""
         response = await http_client.get(
@@ -421,7 +568,6 @@ class TestExport:
         # Response should be JSON with export data
         assert "export_date" in response or isinstance(response, (dict, list))
 
-    @pytest.mark.asyncio
     async def test_export_csv(self, user_jwt_token: str):
         """Test exporting analytics data as CSV."""
         # For CSV, we can't easily verify the structure in the same way
@@ -437,31 +583,51 @@ class TestExport:
             pass
 
 
+class TestQueryValidation:
+    """Tests that out-of-range query values are rejected."""
+
+    @pytest.mark.parametrize(
+        "path,params",
+        [
+            (OVERVIEW_ENDPOINT, {"period": "1y"}),
+            (EXECUTIONS_ENDPOINT, {"sort_order": "up"}),
+            (EXPORT_ENDPOINT, {"format": "xml"}),
+        ],
+    )
+    async def test_invalid_query_value(self, user_jwt_token: str, path: str, params: dict):
+        """Test that a value outside the allowed set returns 422."""
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            await http_client.get(
+                path=path,
+                params=params,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            )
+        assert exc_info.value.status == 422
+
+
 class TestAnalyticsIntegration:
     """Integration tests for analytics functionality."""
 
-    @pytest.mark.asyncio
     async def test_analytics_workflow(self, user_jwt_token: str):
         """Test a complete analytics workflow."""
-        # 1. Get overview
-        overview = await http_client.get(
-            path=OVERVIEW_ENDPOINT,
-            headers={"Authorization": f"Bearer {user_jwt_token}"},
+        # 1-3. Get the overview, executions list and cost summary; they only
+        # read, so they are requested at the same time
+        overview, executions, cost_summary = await asyncio.gather(
+            http_client.get(
+                path=OVERVIEW_ENDPOINT,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            ),
+            http_client.get(
+                path=EXECUTIONS_ENDPOINT,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            ),
+            http_client.get(
+                path=COST_SUMMARY_ENDPOINT,
+                headers={"Authorization": f"Bearer {user_jwt_token}"},
+            ),
         )
         assert overview is not None
-
-        # 2. Get executions list
-        executions = await http_client.get(
-            path=EXECUTIONS_ENDPOINT,
-            headers={"Authorization": f"Bearer {user_jwt_token}"},
-        )
         assert "items" in executions
-
-        # 3. Get cost summary
-        cost_summary = await http_client.get(
-            path=COST_SUMMARY_ENDPOINT,
-            headers={"Authorization": f"Bearer {user_jwt_token}"},
-        )
         assert "total_cost_usd" in cost_summary
 
         # 4. Create a budget alert
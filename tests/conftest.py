@@ -185,6 +185,26 @@ async def user_jwt_token(registered_user, db_cleanup):
     return token
 
 
+@pytest_asyncio.fixture(scope="session")
+async def other_user_jwt_token(db_cleanup):
+    """
+    Registers and logs in a second user, for checking that one user cannot
+    reach another's objects.
+    """
+    creds = {
+        "username": _generate_random_string(8).capitalize(),
+        "password": _generate_password_with_special_char(8),
+    }
+    await http_client.post(path="/api/register", json=creds)
+
+    form_data = aiohttp.FormData()
+    form_data.add_field(name="username", value=creds["username"])
+    form_data.add_field(name="password", value=creds["password"])
+    response = await http_client.post(path="/api/login/access-token", data=form_data)
+
+    return response["access_token"]
+
+
 def _generate_alias(agent_name: str):
     rand_alnum_str = "".join(random.choice(string.ascii_lowercase) for _ in range(6))
     return f"{agent_name}_{rand_alnum_str}"